@@ -0,0 +1,72 @@
+"""Замер времени запуска бота до готовности принимать обновления.
+
+Каждый прогон выполняется в отдельном процессе интерпретатора, чтобы
+учитывать холодный импорт модулей, как при перезапуске контейнера.
+Замеряются импорт links_generator.main, создание менеджеров и настройка
+диспетчера — все, что происходит до начала поллинга.
+
+Пример запуска из корня проекта:
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SNIPPET = """
+import json, os, time
+started = time.perf_counter()
+import links_generator.main as main
+imported = time.perf_counter()
+from aiogram import Dispatcher
+workers = main.create_workers()
+dp = Dispatcher()
+main.handler_commands.setup(
+    dp, workers["sheets_pool"], workers["vk_api_worker"],
+    workers["db_worker"], workers["admin_id"], workers["analytics_refresher"],
+    workers["job_queue"], workers["slow_threshold"])
+ready = time.perf_counter()
+workers["sheets_pool"].close()
+workers["db_worker"].close()
+print(json.dumps({"import": imported - started, "ready": ready - started}))
+"""
+
+
+def run_once(cwd: str) -> dict:
+    """Выполняет один замер в отдельном процессе.
+
+    Args:
+        cwd: Рабочая директория процесса (в ней создается data/users.db).
+
+    Returns:
+        dict: Время импорта и время до готовности в секундах.
+    """
+    env = {**os.environ, "PYTHONPATH": os.getcwd()}
+    output = subprocess.check_output(
+        [sys.executable, "-c", SNIPPET], cwd=cwd, env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Запускает серию замеров и печатает медиану и максимум."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="количество прогонов")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        os.makedirs(os.path.join(cwd, "data"))
+        results = [run_once(cwd) for _ in range(args.runs)]
+
+    for key in ("import", "ready"):
+        values = [result[key] * 1000 for result in results]
+        print(f"{key:>6}: медиана {statistics.median(values):.1f} мс, "
+              f"максимум {max(values):.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+
+from links_generator.singleflight import KeyedLocks
+from links_generator.timing import add_rows
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsRefresher:
+    """Фоновый пересчет аналитики переходов по ссылкам текущего мероприятия.
+
+    Периодически для каждой обслуживаемой таблицы читает короткие ссылки из
+    листа 'Текущее мероприятие', запрашивает статистику переходов,
+    записывает суммы в колонку F и сохраняет снимок в базу данных. Команда
+    /analytics отвечает из последнего снимка таблицы, не дожидаясь
+    запросов к VK и Google Sheets.
+
+    Attributes:
+        interval (float): Период обновления в секундах. 0 отключает фоновое обновление.
+    """
+
+    def __init__(self, sheets_pool, vk_api_worker, db_worker, interval=900):
+        """Инициализирует AnalyticsRefresher.
+
+        Args:
+            sheets_pool: Экземпляр SheetsManagerPool с менеджерами таблиц
+            vk_api_worker: Экземпляр AsyncVKLinkManager для работы с VK API
+            db_worker: Экземпляр AsyncDatabaseManager для хранения снимков и
+                привязок чатов к таблицам
+            interval (float, optional): Период обновления в секундах. Defaults to 900.
+        """
+        self._sheets_pool = sheets_pool
+        self._vk_api_worker = vk_api_worker
+        self._db_worker = db_worker
+        self.interval = interval
+        self._task = None
+        self._locks = KeyedLocks()
+
+    async def table_ids(self) -> list[str]:
+        """Возвращает ID таблиц, аналитика которых обновляется в фоне.
+
+        Returns:
+            list[str]: Таблица по умолчанию и все таблицы, привязанные к чатам.
+        """
+        table_ids = [self._sheets_pool.default_table_id]
+        for table_id in await self._db_worker.get_bound_spreadsheets():
+            if table_id not in table_ids:
+                table_ids.append(table_id)
+        return table_ids
+
+    async def refresh(self, table_id=None, use_cache=True) -> dict:
+        """Пересчитывает аналитику таблицы и сохраняет новый снимок.
+
+        Для одной таблицы одновременно выполняется не более одного
+        пересчета; повторный вызов дожидается текущего.
+
+        Args:
+            table_id (str, optional): ID Google-таблицы. По умолчанию таблица пула
+                по умолчанию.
+            use_cache (bool, optional): Использовать ли кэш статистики VK. Defaults to True.
+
+        Returns:
+            dict: Снимок с ключами created_at и links, см.
+                DatabaseManager.get_analytics_snapshot.
+        """
+        google_worker = self._sheets_pool.get(table_id)
+        partner_index = google_worker.partner_index
+        async with self._locks.hold(google_worker.table_id):
+            partner_index.sync_event(await google_worker.get_event_rows())
+            entries = partner_index.with_short_link()
+            links_stats = await self._vk_api_worker.get_links_stats(
+                [entry.short_link for entry in entries], use_cache=use_cache)
+            clicks = {
+                entry.row:
+                    sum(item["views"] for item in link_stats["stats"]) if link_stats else ""
+                for entry, link_stats in zip(entries, links_stats)
+            }
+            links = [[entry.short_link, clicks[entry.row]] for entry in entries]
+            add_rows(len(links))
+            if links:
+                await google_worker.writer.write_columns(
+                    "Текущее мероприятие", {"F": partner_index.column(clicks)})
+            await self._db_worker.save_analytics_snapshot(google_worker.table_id, links)
+            return {"created_at": time.time(), "links": links}
+
+    async def latest(self, table_id=None) -> dict | None:
+        """Возвращает последний сохраненный снимок аналитики таблицы.
+
+        Args:
+            table_id (str, optional): ID Google-таблицы. По умолчанию таблица пула
+                по умолчанию.
+
+        Returns:
+            dict | None: Снимок или None, если аналитика еще не считалась.
+        """
+        return await self._db_worker.get_analytics_snapshot(
+            table_id or self._sheets_pool.default_table_id)
+
+    async def _run(self) -> None:
+        """Бесконечный цикл фонового обновления."""
+        while True:
+            for table_id in await self.table_ids():
+                try:
+                    await self.refresh(table_id)
+                    logger.info("Аналитика переходов таблицы %s обновлена", table_id)
+                except Exception:
+                    logger.exception("Ошибка фонового обновления аналитики таблицы %s",
+                                     table_id)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Запускает фоновое обновление, если задан положительный интервал."""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновое обновление."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1 +1,4 @@
 from .databases import DatabaseManager
+from .role_cache import RoleCache
+from .async_databases import AsyncDatabaseManager
+from .jobs import JobStore
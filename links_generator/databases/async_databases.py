@@ -0,0 +1,159 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from links_generator.metrics import track
+
+from .databases import DatabaseManager
+from .role_cache import RoleCache
+
+
+class AsyncDatabaseManager:
+    """Асинхронный фасад над DatabaseManager.
+
+    Соединения sqlite3 нельзя использовать из разных потоков, поэтому каждый
+    поток получает собственный DatabaseManager. Все записи выполняются в
+    одном потоке-писателе, что исключает конкуренцию за блокировку базы,
+    а чтения — в пуле потоков-читателей, которые в режиме WAL не ждут
+    завершения записи. Цикл событий при обращении к базе не блокируется.
+
+    Проверка прав администратора сначала обращается к общему RoleCache
+    и при попадании в кэш не переключается в поток.
+
+    Attributes:
+        path (str): Путь к файлу базы данных.
+        role_cache (RoleCache): Кэш ролей, общий для всех соединений.
+    """
+
+    def __init__(self, path, readers=4, role_cache=None):
+        """Инициализирует AsyncDatabaseManager и создает структуру таблиц.
+
+        Структура таблиц создается синхронно в потоке-писателе до того, как
+        к базе обратятся читатели.
+
+        Args:
+            path (str): Путь к файлу базы данных SQLite.
+            readers (int, optional): Количество потоков-читателей. Defaults to 4.
+            role_cache (RoleCache, optional): Кэш ролей. По умолчанию создается собственный.
+        """
+        self.path = path
+        self.role_cache = role_cache or RoleCache()
+        self._local = threading.local()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+        self._writer.submit(self._get_manager, True).result()
+
+    def _get_manager(self, create=False) -> DatabaseManager:
+        """Возвращает DatabaseManager текущего потока.
+
+        Args:
+            create (bool, optional): Создавать ли структуру таблиц. Defaults to False.
+
+        Returns:
+            DatabaseManager: Менеджер, принадлежащий только этому потоку.
+        """
+        manager = getattr(self._local, "manager", None)
+        if manager is None:
+            manager = DatabaseManager(self.path, role_cache=self.role_cache, create=create)
+            self._local.manager = manager
+        return manager
+
+    async def _run(self, executor, method: str, *args):
+        """Выполняет метод DatabaseManager в указанном пуле потоков.
+
+        Количество, ошибки и длительность вызовов учитываются в метриках
+        по названию метода, без ожидания свободного потока.
+
+        Args:
+            executor: Пул потоков писателя или читателей.
+            method: Название метода DatabaseManager.
+            *args: Позиционные аргументы метода.
+
+        Returns:
+            Any: Результат метода.
+        """
+        def call():
+            with track("db", method):
+                return getattr(self._get_manager(), method)(*args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, call)
+
+    async def _read(self, method: str, *args):
+        """Выполняет читающий метод DatabaseManager в потоке-читателе."""
+        return await self._run(self._readers, method, *args)
+
+    async def _write(self, method: str, *args):
+        """Выполняет изменяющий метод DatabaseManager в потоке-писателе."""
+        return await self._run(self._writer, method, *args)
+
+    def close(self) -> None:
+        """Останавливает потоки, дожидаясь текущих запросов."""
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+
+    async def user_exists(self, tg_id: int) -> bool:
+        """Асинхронная версия DatabaseManager.user_exists."""
+        return await self._read("user_exists", tg_id)
+
+    async def add_user(self, tg_id: int, role_name: str = "user") -> bool:
+        """Асинхронная версия DatabaseManager.add_user."""
+        return await self._write("add_user", tg_id, role_name)
+
+    async def add_admin(self, tg_id: int) -> bool:
+        """Асинхронная версия DatabaseManager.add_admin."""
+        return await self._write("add_admin", tg_id)
+
+    async def is_admin(self, tg_id: int) -> bool:
+        """Асинхронная версия DatabaseManager.is_admin.
+
+        При попадании в кэш ролей отвечает без обращения к базе.
+        """
+        cached = self.role_cache.get(tg_id)
+        if cached is not None:
+            return cached
+        return await self._read("is_admin", tg_id)
+
+    async def remove_admin(self, tg_id: int) -> bool:
+        """Асинхронная версия DatabaseManager.remove_admin."""
+        return await self._write("remove_admin", tg_id)
+
+    async def add_admins(self, tg_ids: list[int]) -> dict[int, str]:
+        """Асинхронная версия DatabaseManager.add_admins."""
+        return await self._write("add_admins", tg_ids)
+
+    async def remove_admins(self, tg_ids: list[int]) -> dict[int, str]:
+        """Асинхронная версия DatabaseManager.remove_admins."""
+        return await self._write("remove_admins", tg_ids)
+
+    async def get_cached_short_links(self, long_urls: list[str], private: bool = False) -> dict:
+        """Асинхронная версия DatabaseManager.get_cached_short_links."""
+        return await self._read("get_cached_short_links", long_urls, private)
+
+    async def cache_short_links(self, short_links: dict, private: bool = False) -> bool:
+        """Асинхронная версия DatabaseManager.cache_short_links."""
+        return await self._write("cache_short_links", short_links, private)
+
+    async def save_analytics_snapshot(self, table_id: str, links: list) -> bool:
+        """Асинхронная версия DatabaseManager.save_analytics_snapshot."""
+        return await self._write("save_analytics_snapshot", table_id, links)
+
+    async def get_analytics_snapshot(self, table_id: str) -> dict | None:
+        """Асинхронная версия DatabaseManager.get_analytics_snapshot."""
+        return await self._read("get_analytics_snapshot", table_id)
+
+    async def bind_spreadsheet(self, chat_id: int, table_id: str) -> bool:
+        """Асинхронная версия DatabaseManager.bind_spreadsheet."""
+        return await self._write("bind_spreadsheet", chat_id, table_id)
+
+    async def unbind_spreadsheet(self, chat_id: int) -> bool:
+        """Асинхронная версия DatabaseManager.unbind_spreadsheet."""
+        return await self._write("unbind_spreadsheet", chat_id)
+
+    async def get_spreadsheet(self, chat_id: int) -> str | None:
+        """Асинхронная версия DatabaseManager.get_spreadsheet."""
+        return await self._read("get_spreadsheet", chat_id)
+
+    async def get_bound_spreadsheets(self) -> list[str]:
+        """Асинхронная версия DatabaseManager.get_bound_spreadsheets."""
+        return await self._read("get_bound_spreadsheets")
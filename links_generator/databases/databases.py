@@ -1,4 +1,8 @@
+import json
 import sqlite3
+import time
+
+from .role_cache import RoleCache
 
 
 class DatabaseManager:
@@ -7,41 +11,77 @@ class DatabaseManager:
     Обеспечивает взаимодействие с базой данных для выполнения операций:
     - Создание и инициализация структуры БД
     - Управление пользователями (добавление, проверка существования)
-    - Управление ролями (назначение/снятие прав администратора)
+    - Управление ролями (назначение/снятие прав администратора, в том числе пакетно)
+    - Кэширование созданных коротких ссылок
+    - Хранение последних снимков аналитики переходов
+    - Привязка чатов к Google-таблицам
 
     Attributes:
         path (str): Путь к файлу базы данных
         connection (sqlite3.Connection): Активное соединение с БД
+        role_cache (RoleCache): Кэш признака администратора для is_admin
     """
 
-    def __init__(self, path):
+    ROLE_UPDATED = "updated"
+    """str: Роль пользователя изменена."""
+    ROLE_UNCHANGED = "unchanged"
+    """str: У пользователя уже была нужная роль."""
+    ROLE_NOT_FOUND = "not_found"
+    """str: Пользователь не найден в базе данных."""
+    ROLE_ERROR = "error"
+    """str: Ошибка базы данных, изменения отменены."""
+
+    def __init__(self, path, role_cache=None, create=True, cached_statements=256):
         """Инициализирует соединение с базой данных и создает структуру таблиц.
 
+        Соединение работает в режиме WAL: чтение из других соединений не
+        блокируется записью, а фиксация транзакции не требует синхронизации
+        основного файла базы. Подготовленные запросы кэшируются соединением.
+
         Args:
             path (str): Путь к файлу базы данных SQLite
+            role_cache (RoleCache, optional): Кэш ролей, общий для нескольких
+                соединений с этой базой. По умолчанию создается собственный.
+            create (bool, optional): Создавать ли структуру таблиц. Соединениям
+                только для чтения это не нужно. Defaults to True.
+            cached_statements (int, optional): Размер кэша подготовленных
+                запросов соединения. Defaults to 256.
         """
         self.path = path
-        self.connection = sqlite3.connect(self.path)
-        self.create_db()
+        self.role_cache = role_cache or RoleCache()
+        self.connection = sqlite3.connect(
+            self.path, cached_statements=cached_statements)
+        self.configure()
+        if create:
+            self.create_db()
 
     def __del__(self):
         """Закрывает соединение с базой данных при уничтожении объекта."""
         self.connection.close()
 
+    def configure(self):
+        """Настраивает соединение: режим WAL, ожидание блокировок и внешние ключи."""
+        cur = self.connection.cursor()
+        cur.execute("PRAGMA journal_mode = WAL")
+        cur.execute("PRAGMA synchronous = NORMAL")
+        cur.execute("PRAGMA busy_timeout = 5000")
+        cur.execute("PRAGMA foreign_keys = ON")
+
     def create_db(self):
         """Создает структуру базы данных при первом запуске.
 
         Создает таблицы:
         - role: Справочник ролей пользователей
         - users: Таблица зарегистрированных пользователей
+        - short_links: Кэш коротких ссылок VK по нормализованному длинному URL
+        - analytics_snapshots: Последние снимки аналитики переходов по таблицам
+        - spreadsheet_bindings: Привязка чатов к Google-таблицам
 
         Добавляет стандартные роли (admin, user) при их отсутствии.
         """
         conn = self.connection
         cur = conn.cursor()
 
-        cur.execute("PRAGMA foreign_keys = ON")
-
         cur.execute("""CREATE TABLE IF NOT EXISTS role (
                         id_role integer NOT NULL PRIMARY KEY,
                         role_name varchar(500) NOT NULL UNIQUE
@@ -54,6 +94,25 @@ class DatabaseManager:
                         FOREIGN KEY (id_role) REFERENCES role(id_role)
                         )""")
 
+        cur.execute("""CREATE TABLE IF NOT EXISTS short_links (
+                        long_url text NOT NULL,
+                        private integer NOT NULL,
+                        short_url text NOT NULL,
+                        created_at timestamp DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (long_url, private)
+                        )""")
+
+        cur.execute("""CREATE TABLE IF NOT EXISTS analytics_snapshots (
+                        table_id text PRIMARY KEY,
+                        created_at real NOT NULL,
+                        data text NOT NULL
+                        )""")
+
+        cur.execute("""CREATE TABLE IF NOT EXISTS spreadsheet_bindings (
+                        chat_id integer PRIMARY KEY,
+                        table_id text NOT NULL
+                        )""")
+
         default_roles = [(1, 'admin'), (2, 'user')]
         cur.executemany(
             "INSERT OR IGNORE INTO role (id_role, role_name) VALUES (?, ?)",
@@ -87,27 +146,24 @@ class DatabaseManager:
 
         Raises:
             ValueError: Если указанная роль не найдена в базе
-        """
-        if self.user_exists(tg_id):
-            return False
 
+        Note:
+            Пользователь добавляется одним запросом INSERT ... SELECT, роль
+            ищется в том же запросе, существующий пользователь пропускается.
+        """
         try:
-            cur = self.connection.cursor()
-
-            cur.execute(
-                "SELECT id_role FROM role WHERE role_name = ?",
-                (role_name,)
-            )
-            role_data = cur.fetchone()
-
-            if not role_data:
-                raise ValueError(f"Роль '{role_name}' не найдена")
-
-            cur.execute(
-                "INSERT INTO users (tg_id, id_role) VALUES (?, ?)",
-                (tg_id, role_data[0])
+            cur = self.connection.execute(
+                "INSERT INTO users (tg_id, id_role) "
+                "SELECT ?, id_role FROM role WHERE role_name = ? "
+                "ON CONFLICT (tg_id) DO NOTHING",
+                (tg_id, role_name)
             )
             self.connection.commit()
+            if cur.rowcount == 0:
+                if not self.user_exists(tg_id):
+                    raise ValueError(f"Роль '{role_name}' не найдена")
+                return False
+            self.role_cache.invalidate(tg_id)
             return True
 
         except sqlite3.Error as e:
@@ -126,23 +182,7 @@ class DatabaseManager:
         Note:
             Пользователь должен существовать в базе данных
         """
-        try:
-            cur = self.connection.cursor()
-
-            cur.execute("SELECT id_role FROM role WHERE role_name = 'admin'")
-            admin_role_id = cur.fetchone()
-
-            admin_role_id = admin_role_id[0]
-            cur.execute(
-                "UPDATE users SET id_role = ? WHERE tg_id = ?",
-                (admin_role_id, tg_id)
-            )
-            self.connection.commit()
-            return True
-
-        except sqlite3.Error as e:
-            print(f"Ошибка при назначении администратора: {e}")
-            return False
+        return self.add_admins([tg_id])[int(tg_id)] != self.ROLE_ERROR
 
     def is_admin(self, tg_id: int) -> bool:
         """Проверяет наличие прав администратора у пользователя.
@@ -153,14 +193,26 @@ class DatabaseManager:
         Returns:
             bool: True если пользователь является администратором,
                   False если нет или пользователь не существует
+
+        Note:
+            Результат кэшируется в role_cache; add_user, add_admin и
+            remove_admin сбрасывают кэш для измененного пользователя.
         """
+        tg_id = int(tg_id)
+        cached = self.role_cache.get(tg_id)
+        if cached is not None:
+            return cached
+
+        version = self.role_cache.version
         cur = self.connection.cursor()
         cur.execute("""
             SELECT 1 FROM users u
             JOIN role r ON u.id_role = r.id_role
             WHERE u.tg_id = ? AND r.role_name = 'admin'
         """, (tg_id,))
-        return cur.fetchone() is not None
+        result = cur.fetchone() is not None
+        self.role_cache.set(tg_id, result, version)
+        return result
 
     def remove_admin(self, tg_id: int) -> bool:
         """Снимает права администратора с пользователя.
@@ -174,20 +226,236 @@ class DatabaseManager:
         Note:
             Пользователь должен существовать в базе данных
         """
+        return self.remove_admins([tg_id])[int(tg_id)] != self.ROLE_ERROR
+
+    def _set_roles(self, tg_ids: list[int], role_name: str) -> dict[int, str]:
+        """Назначает роль нескольким пользователям в одной транзакции.
+
+        Args:
+            tg_ids (list[int]): Telegram ID пользователей
+            role_name (str): Название назначаемой роли
+
+        Returns:
+            dict[int, str]: Результат для каждого ID: ROLE_UPDATED, ROLE_UNCHANGED,
+                ROLE_NOT_FOUND или ROLE_ERROR
+        """
+        tg_ids = list(dict.fromkeys(int(tg_id) for tg_id in tg_ids))
+        current = {}
         try:
             cur = self.connection.cursor()
+            # Ограничение SQLite на количество параметров в одном запросе
+            for i in range(0, len(tg_ids), 500):
+                chunk = tg_ids[i:i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                cur.execute(
+                    f"SELECT u.tg_id, r.role_name FROM users u "
+                    f"JOIN role r ON u.id_role = r.id_role "
+                    f"WHERE u.tg_id IN ({placeholders})",
+                    chunk
+                )
+                current.update(cur.fetchall())
+
+            changed = [tg_id for tg_id in tg_ids
+                       if tg_id in current and current[tg_id] != role_name]
+            cur.executemany(
+                "UPDATE users SET id_role = "
+                "(SELECT id_role FROM role WHERE role_name = ?) WHERE tg_id = ?",
+                [(role_name, tg_id) for tg_id in changed]
+            )
+            self.connection.commit()
+
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            print(f"Ошибка при изменении ролей пользователей: {e}")
+            return {tg_id: self.ROLE_ERROR for tg_id in tg_ids}
+
+        self.role_cache.invalidate(*changed)
+        return {
+            tg_id: self.ROLE_NOT_FOUND if tg_id not in current
+            else self.ROLE_UNCHANGED if current[tg_id] == role_name
+            else self.ROLE_UPDATED
+            for tg_id in tg_ids
+        }
 
-            cur.execute("SELECT id_role FROM role WHERE role_name = 'user'")
-            admin_role_id = cur.fetchone()
+    def add_admins(self, tg_ids: list[int]) -> dict[int, str]:
+        """Назначает администраторами несколько пользователей одной транзакцией.
 
-            admin_role_id = admin_role_id[0]
+        Args:
+            tg_ids (list[int]): Telegram ID пользователей
+
+        Returns:
+            dict[int, str]: Результат для каждого ID: ROLE_UPDATED, ROLE_UNCHANGED
+                (уже администратор), ROLE_NOT_FOUND (не заходил в бота) или ROLE_ERROR
+        """
+        return self._set_roles(tg_ids, "admin")
+
+    def remove_admins(self, tg_ids: list[int]) -> dict[int, str]:
+        """Снимает права администратора с нескольких пользователей одной транзакцией.
+
+        Args:
+            tg_ids (list[int]): Telegram ID пользователей
+
+        Returns:
+            dict[int, str]: Результат для каждого ID: ROLE_UPDATED, ROLE_UNCHANGED
+                (не был администратором), ROLE_NOT_FOUND (не заходил в бота) или ROLE_ERROR
+        """
+        return self._set_roles(tg_ids, "user")
+
+    def get_cached_short_links(self, long_urls: list[str], private: bool = False) -> dict:
+        """Возвращает сохраненные короткие ссылки для списка длинных URL.
+
+        Args:
+            long_urls (list[str]): Нормализованные длинные URL
+            private (bool, optional): Флаг приватной ссылки. По умолчанию False.
+
+        Returns:
+            dict: Словарь {длинный URL: короткая ссылка} только для найденных URL
+        """
+        cached = {}
+        cur = self.connection.cursor()
+        # Ограничение SQLite на количество параметров в одном запросе
+        for i in range(0, len(long_urls), 500):
+            chunk = long_urls[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
             cur.execute(
-                "UPDATE users SET id_role = ? WHERE tg_id = ?",
-                (admin_role_id, tg_id)
+                f"SELECT long_url, short_url FROM short_links "
+                f"WHERE private = ? AND long_url IN ({placeholders})",
+                (int(private), *chunk)
+            )
+            cached.update(cur.fetchall())
+        return cached
+
+    def cache_short_links(self, short_links: dict, private: bool = False) -> bool:
+        """Сохраняет созданные короткие ссылки в кэш.
+
+        Args:
+            short_links (dict): Словарь {нормализованный длинный URL: короткая ссылка}
+            private (bool, optional): Флаг приватной ссылки. По умолчанию False.
+
+        Returns:
+            bool: True при успешном сохранении, False при ошибке
+        """
+        try:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO short_links (long_url, private, short_url) "
+                "VALUES (?, ?, ?)",
+                [(long_url, int(private), short_url)
+                 for long_url, short_url in short_links.items()]
+            )
+            self.connection.commit()
+            return True
+
+        except sqlite3.Error as e:
+            print(f"Ошибка при сохранении коротких ссылок: {e}")
+            return False
+
+    def save_analytics_snapshot(self, table_id: str, links: list) -> bool:
+        """Сохраняет снимок аналитики переходов таблицы, заменяя предыдущий.
+
+        Args:
+            table_id (str): ID Google-таблицы
+            links (list): Список пар [короткая ссылка, количество переходов]
+
+        Returns:
+            bool: True при успешном сохранении, False при ошибке
+        """
+        try:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO analytics_snapshots (table_id, created_at, data) "
+                "VALUES (?, ?, ?)",
+                (table_id, time.time(), json.dumps(links, ensure_ascii=False))
+            )
+            self.connection.commit()
+            return True
+
+        except sqlite3.Error as e:
+            print(f"Ошибка при сохранении аналитики: {e}")
+            return False
+
+    def get_analytics_snapshot(self, table_id: str) -> dict | None:
+        """Возвращает последний сохраненный снимок аналитики переходов таблицы.
+
+        Args:
+            table_id (str): ID Google-таблицы
+
+        Returns:
+            dict | None: Словарь с ключами created_at (unix-время создания)
+                и links (список пар [короткая ссылка, количество переходов])
+                или None, если снимок еще не создавался
+        """
+        cur = self.connection.cursor()
+        cur.execute(
+            "SELECT created_at, data FROM analytics_snapshots WHERE table_id = ?",
+            (table_id,)
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        return {"created_at": row[0], "links": json.loads(row[1])}
+
+    def bind_spreadsheet(self, chat_id: int, table_id: str) -> bool:
+        """Привязывает чат к Google-таблице.
+
+        Args:
+            chat_id (int): Telegram ID чата
+            table_id (str): ID Google-таблицы
+
+        Returns:
+            bool: True при успешной привязке, False при ошибке
+        """
+        try:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO spreadsheet_bindings (chat_id, table_id) "
+                "VALUES (?, ?)",
+                (chat_id, table_id)
             )
             self.connection.commit()
             return True
 
         except sqlite3.Error as e:
-            print(f"Ошибка при удалении администратора: {e}")
+            print(f"Ошибка при привязке таблицы: {e}")
             return False
+
+    def unbind_spreadsheet(self, chat_id: int) -> bool:
+        """Удаляет привязку чата к Google-таблице.
+
+        Args:
+            chat_id (int): Telegram ID чата
+
+        Returns:
+            bool: True если привязка была удалена, False если ее не было или произошла ошибка
+        """
+        try:
+            cur = self.connection.execute(
+                "DELETE FROM spreadsheet_bindings WHERE chat_id = ?", (chat_id,))
+            self.connection.commit()
+            return cur.rowcount > 0
+
+        except sqlite3.Error as e:
+            print(f"Ошибка при удалении привязки таблицы: {e}")
+            return False
+
+    def get_spreadsheet(self, chat_id: int) -> str | None:
+        """Возвращает ID Google-таблицы, привязанной к чату.
+
+        Args:
+            chat_id (int): Telegram ID чата
+
+        Returns:
+            str | None: ID таблицы или None, если чат не привязан
+        """
+        cur = self.connection.cursor()
+        cur.execute(
+            "SELECT table_id FROM spreadsheet_bindings WHERE chat_id = ?", (chat_id,))
+        row = cur.fetchone()
+        return row[0] if row else None
+
+    def get_bound_spreadsheets(self) -> list[str]:
+        """Возвращает ID всех Google-таблиц, к которым привязан хотя бы один чат.
+
+        Returns:
+            list[str]: Список уникальных ID таблиц
+        """
+        cur = self.connection.cursor()
+        cur.execute("SELECT DISTINCT table_id FROM spreadsheet_bindings")
+        return [row[0] for row in cur.fetchall()]
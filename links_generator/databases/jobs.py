@@ -0,0 +1,282 @@
+import json
+import sqlite3
+import time
+
+
+class JobStore:
+    """Хранилище фоновых задач и их контрольных точек в SQLite.
+
+    Задача проходит состояния queued → running → done | failed | cancelled.
+    Для задач генерации ссылок после каждой записи в таблицу сохраняются
+    контрольные точки — готовые ссылки по строкам партнеров, поэтому
+    прерванная задача продолжается с места остановки.
+
+    Note:
+        Соединение открывается с check_same_thread=False, но методы должны
+        вызываться из одного потока одновременно, см. JobQueue.
+
+    Attributes:
+        path (str): Путь к файлу базы данных
+        connection (sqlite3.Connection): Активное соединение с БД
+    """
+
+    ACTIVE = ("queued", "running")
+    """tuple[str]: Состояния незавершенной задачи."""
+
+    def __init__(self, path):
+        """Инициализирует соединение с базой данных и создает структуру таблиц.
+
+        Args:
+            path (str): Путь к файлу базы данных SQLite
+        """
+        self.path = path
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.create_db()
+
+    def __del__(self):
+        """Закрывает соединение с базой данных при уничтожении объекта."""
+        self.connection.close()
+
+    def create_db(self):
+        """Создает структуру базы данных при первом запуске.
+
+        Создает таблицы:
+        - jobs: Задачи с параметрами, состоянием и прогрессом
+        - job_checkpoints: Готовые ссылки задач по столбцам и строкам
+        """
+        cur = self.connection.cursor()
+        cur.execute("PRAGMA journal_mode = WAL")
+        cur.execute("PRAGMA synchronous = NORMAL")
+
+        cur.execute("""CREATE TABLE IF NOT EXISTS jobs (
+                        id integer PRIMARY KEY AUTOINCREMENT,
+                        kind text NOT NULL,
+                        chat_id integer NOT NULL,
+                        table_id text NOT NULL,
+                        params text NOT NULL,
+                        status text NOT NULL DEFAULT 'queued',
+                        message_id integer,
+                        total integer NOT NULL DEFAULT 0,
+                        done integer NOT NULL DEFAULT 0,
+                        failed integer NOT NULL DEFAULT 0,
+                        error text,
+                        created_at real NOT NULL,
+                        started_at real,
+                        finished_at real
+                        )""")
+        cur.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+        cur.execute("""CREATE TABLE IF NOT EXISTS job_checkpoints (
+                        job_id integer NOT NULL,
+                        column_name text NOT NULL,
+                        row integer NOT NULL,
+                        long_url text NOT NULL,
+                        short_url text NOT NULL,
+                        PRIMARY KEY (job_id, column_name, row),
+                        FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+                        )""")
+        self.connection.commit()
+
+    @staticmethod
+    def _to_dict(row) -> dict | None:
+        """Преобразует строку таблицы jobs в словарь с разобранными параметрами."""
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        return job
+
+    def enqueue(self, kind: str, chat_id: int, table_id: str, params: dict) -> tuple[int, bool]:
+        """Ставит задачу в очередь, если такая же задача этого чата еще не выполняется.
+
+        Задачи разных чатов не объединяются: ход и результат задачи видны
+        только в чате, который ее поставил.
+
+        Args:
+            kind (str): Тип задачи
+            chat_id (int): Telegram ID чата, поставившего задачу
+            table_id (str): ID Google-таблицы задачи
+            params (dict): Параметры задачи
+
+        Returns:
+            tuple[int, bool]: ID задачи и флаг, что задача создана, а не найдена
+                среди незавершенных задач чата с теми же параметрами
+        """
+        encoded = json.dumps(params, ensure_ascii=False, sort_keys=True)
+        cur = self.connection.execute(
+            "SELECT id FROM jobs WHERE kind = ? AND chat_id = ? AND table_id = ? "
+            "AND params = ? AND status IN (?, ?) ORDER BY id LIMIT 1",
+            (kind, chat_id, table_id, encoded, *self.ACTIVE)
+        )
+        row = cur.fetchone()
+        if row is not None:
+            return row["id"], False
+        cur = self.connection.execute(
+            "INSERT INTO jobs (kind, chat_id, table_id, params, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (kind, chat_id, table_id, encoded, time.time())
+        )
+        self.connection.commit()
+        return cur.lastrowid, True
+
+    def set_message(self, job_id: int, message_id: int) -> None:
+        """Запоминает сообщение, в котором отображается ход задачи.
+
+        Args:
+            job_id (int): ID задачи
+            message_id (int): ID сообщения в чате задачи
+        """
+        self.connection.execute(
+            "UPDATE jobs SET message_id = ? WHERE id = ?", (message_id, job_id))
+        self.connection.commit()
+
+    def get(self, job_id: int) -> dict | None:
+        """Возвращает задачу по ID.
+
+        Args:
+            job_id (int): ID задачи
+
+        Returns:
+            dict | None: Поля задачи или None, если задача не найдена
+        """
+        cur = self.connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._to_dict(cur.fetchone())
+
+    def list_jobs(self, chat_id: int, limit: int = 10) -> list[dict]:
+        """Возвращает последние задачи чата.
+
+        Args:
+            chat_id (int): Telegram ID чата
+            limit (int, optional): Максимальное количество задач. По умолчанию 10.
+
+        Returns:
+            list[dict]: Задачи от новых к старым
+        """
+        cur = self.connection.execute(
+            "SELECT * FROM jobs WHERE chat_id = ? ORDER BY id DESC LIMIT ?",
+            (chat_id, limit)
+        )
+        return [self._to_dict(row) for row in cur.fetchall()]
+
+    def claim_next(self, busy_tables: list[str]) -> dict | None:
+        """Переводит самую раннюю задачу из очереди в состояние running.
+
+        Args:
+            busy_tables (list[str]): Таблицы, задачи которых сейчас брать нельзя
+
+        Returns:
+            dict | None: Взятая задача или None, если подходящих задач нет
+        """
+        placeholders = ", ".join("?" * len(busy_tables))
+        cur = self.connection.execute(
+            "SELECT * FROM jobs WHERE status = 'queued' "
+            + (f"AND table_id NOT IN ({placeholders}) " if busy_tables else "")
+            + "ORDER BY id LIMIT 1",
+            busy_tables
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        self.connection.execute(
+            "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+            (time.time(), row["id"])
+        )
+        self.connection.commit()
+        return self.get(row["id"])
+
+    def requeue_running(self) -> int:
+        """Возвращает в очередь задачи, прерванные перезапуском бота.
+
+        Returns:
+            int: Количество возвращенных задач
+        """
+        cur = self.connection.execute(
+            "UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+        self.connection.commit()
+        return cur.rowcount
+
+    def set_progress(self, job_id: int, total: int, done: int, failed: int) -> None:
+        """Сохраняет прогресс задачи.
+
+        Args:
+            job_id (int): ID задачи
+            total (int): Общее количество ссылок
+            done (int): Количество обработанных ссылок
+            failed (int): Количество ссылок, которые не удалось создать
+        """
+        self.connection.execute(
+            "UPDATE jobs SET total = ?, done = ?, failed = ? WHERE id = ?",
+            (total, done, failed, job_id)
+        )
+        self.connection.commit()
+
+    def save_checkpoints(self, job_id: int, items: list[tuple]) -> None:
+        """Сохраняет готовые ссылки задачи.
+
+        Args:
+            job_id (int): ID задачи
+            items (list[tuple]): Кортежи (столбец, строка, длинный URL, короткая ссылка)
+        """
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO job_checkpoints "
+            "(job_id, column_name, row, long_url, short_url) VALUES (?, ?, ?, ?, ?)",
+            [(job_id, *item) for item in items]
+        )
+        self.connection.commit()
+
+    def get_checkpoints(self, job_id: int) -> dict[tuple[str, int], tuple[str, str]]:
+        """Возвращает готовые ссылки задачи.
+
+        Args:
+            job_id (int): ID задачи
+
+        Returns:
+            dict[tuple[str, int], tuple[str, str]]: Словарь
+                {(столбец, строка): (длинный URL, короткая ссылка)}
+        """
+        cur = self.connection.execute(
+            "SELECT column_name, row, long_url, short_url FROM job_checkpoints "
+            "WHERE job_id = ?", (job_id,)
+        )
+        return {(row[0], row[1]): (row[2], row[3]) for row in cur.fetchall()}
+
+    def finish(self, job_id: int, status: str, error: str | None = None) -> None:
+        """Завершает задачу и удаляет ее контрольные точки.
+
+        Отмененная задача остается отмененной, даже если успела завершиться.
+
+        Args:
+            job_id (int): ID задачи
+            status (str): Итоговое состояние: done или failed
+            error (str, optional): Текст ошибки для состояния failed
+        """
+        self.connection.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+            "WHERE id = ? AND status != 'cancelled'",
+            (status, error, time.time(), job_id)
+        )
+        self.connection.execute("DELETE FROM job_checkpoints WHERE job_id = ?", (job_id,))
+        self.connection.commit()
+
+    def cancel(self, job_id: int) -> str | None:
+        """Отменяет незавершенную задачу.
+
+        Args:
+            job_id (int): ID задачи
+
+        Returns:
+            str | None: Состояние задачи до отмены или None, если задача не найдена
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        if job["status"] in self.ACTIVE:
+            self.connection.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ?",
+                (time.time(), job_id)
+            )
+            self.connection.execute(
+                "DELETE FROM job_checkpoints WHERE job_id = ?", (job_id,))
+            self.connection.commit()
+        return job["status"]
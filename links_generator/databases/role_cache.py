@@ -0,0 +1,75 @@
+import threading
+
+from cachetools import LRUCache
+
+
+class RoleCache:
+    """Кэш признака администратора по Telegram ID с вытеснением LRU.
+
+    Позволяет проверять права администратора без запроса к базе данных.
+    Ключи приводятся к int, так как tg_id хранится в целочисленном столбце,
+    а из аргументов команд приходят строки. Кэш потокобезопасен и может
+    быть общим для нескольких соединений с одной базой.
+
+    Изменения ролей должны сопровождаться вызовом invalidate. Чтобы
+    значение, прочитанное из базы до изменения, не попало в кэш после
+    invalidate, запись выполняется только если с момента чтения версии
+    кэша (см. version) не было инвалидаций.
+    """
+
+    def __init__(self, maxsize=10000):
+        """Инициализирует кэш.
+
+        Args:
+            maxsize (int, optional): Максимальное количество пользователей в кэше.
+                Defaults to 10000.
+        """
+        self._cache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """int: Номер версии кэша, увеличивается при каждой инвалидации."""
+        return self._version
+
+    def get(self, tg_id: int) -> bool | None:
+        """Возвращает сохраненный признак администратора.
+
+        Args:
+            tg_id (int): Telegram ID пользователя
+
+        Returns:
+            bool | None: Признак администратора или None, если пользователя нет в кэше
+        """
+        with self._lock:
+            return self._cache.get(int(tg_id))
+
+    def set(self, tg_id: int, is_admin: bool, version: int) -> None:
+        """Сохраняет признак администратора, прочитанный из базы.
+
+        Args:
+            tg_id (int): Telegram ID пользователя
+            is_admin (bool): Признак администратора
+            version (int): Значение version, полученное до чтения из базы
+        """
+        with self._lock:
+            if version == self._version:
+                self._cache[int(tg_id)] = is_admin
+
+    def invalidate(self, *tg_ids: int) -> None:
+        """Удаляет пользователей из кэша после изменения их ролей.
+
+        Args:
+            *tg_ids (int): Telegram ID пользователей
+        """
+        with self._lock:
+            self._version += 1
+            for tg_id in tg_ids:
+                self._cache.pop(int(tg_id), None)
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        with self._lock:
+            self._version += 1
+            self._cache.clear()
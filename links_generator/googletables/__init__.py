@@ -1 +1,6 @@
 from .worktables import GoogleSheetsManager
+from .async_worktables import AsyncGoogleSheetsManager
+from .diff_writer import SheetDiffWriter
+from .partner_index import PartnerIndex
+from .scheduler import SheetsRequestScheduler
+from .pool import SheetsManagerPool
@@ -0,0 +1,237 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from links_generator.metrics import track
+from links_generator.timing import phase
+
+from .diff_writer import SheetDiffWriter
+from .partner_index import PartnerIndex
+from .scheduler import SheetsRequestScheduler
+from .worktables import GoogleSheetsManager
+
+
+class SheetsExecutor:
+    """Пул потоков для запросов к Google Sheets, общий для нескольких таблиц.
+
+    Объекты googleapiclient и httplib2 не потокобезопасны, поэтому каждый
+    поток пула собирает собственный сервис Google Sheets со своим
+    авторизованным HTTP-клиентом — один раз, независимо от количества таблиц.
+    Менеджеры отдельных таблиц в потоке переиспользуют этот сервис и
+    хранят только ID таблицы.
+
+    Attributes:
+        max_workers (int): Количество потоков пула.
+    """
+
+    def __init__(self, max_workers=4):
+        """Инициализирует SheetsExecutor.
+
+        Сервисы в потоках создаются лениво, при первом вызове в каждом потоке.
+
+        Args:
+            max_workers (int, optional): Количество потоков пула. Defaults to 4.
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sheets")
+        self._local = threading.local()
+        self._managers = {}
+        self._lock = threading.Lock()
+
+    def _base(self) -> GoogleSheetsManager:
+        """Возвращает менеджер с сервисом Google Sheets текущего потока пула.
+
+        Returns:
+            GoogleSheetsManager: Менеджер, принадлежащий только этому потоку.
+        """
+        base = getattr(self._local, "base", None)
+        if base is None:
+            base = GoogleSheetsManager(None)
+            self._local.base = base
+        return base
+
+    def _get_manager(self, table_id: str) -> GoogleSheetsManager:
+        """Возвращает менеджер таблицы для текущего потока пула.
+
+        Args:
+            table_id: ID Google-таблицы.
+
+        Returns:
+            GoogleSheetsManager: Менеджер таблицы, использующий сервис этого потока.
+        """
+        key = (threading.get_ident(), table_id)
+        with self._lock:
+            manager = self._managers.get(key)
+        if manager is None:
+            manager = GoogleSheetsManager(table_id, shared=self._base())
+            with self._lock:
+                self._managers[key] = manager
+        return manager
+
+    async def run(self, table_id: str, method: str, *args, **kwargs):
+        """Выполняет метод GoogleSheetsManager таблицы в пуле потоков.
+
+        Количество, ошибки и длительность вызовов учитываются в метриках
+        по названию метода, без ожидания свободного потока.
+
+        Args:
+            table_id: ID Google-таблицы.
+            method: Название метода GoogleSheetsManager.
+            *args: Позиционные аргументы метода.
+            **kwargs: Именованные аргументы метода.
+
+        Returns:
+            Any: Результат метода.
+        """
+        def call():
+            with track("sheets", method):
+                return getattr(self._get_manager(table_id), method)(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call)
+
+    async def warm_up(self) -> None:
+        """Заранее собирает сервисы в потоках пула и получает токен доступа."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, lambda: self._base().warm_up())
+            for _ in range(self.max_workers)))
+
+    def forget(self, table_id: str) -> None:
+        """Удаляет менеджеры таблицы во всех потоках.
+
+        Args:
+            table_id: ID Google-таблицы.
+        """
+        with self._lock:
+            for key in [key for key in self._managers if key[1] == table_id]:
+                del self._managers[key]
+
+    def close(self) -> None:
+        """Останавливает пул потоков, дожидаясь текущих запросов."""
+        self._executor.shutdown(wait=True)
+
+
+class AsyncGoogleSheetsManager:
+    """Асинхронный фасад над GoogleSheetsManager для одной таблицы.
+
+    Вызовы выполняются в пуле потоков SheetsExecutor и не блокируют цикл
+    событий. Пул может быть общим для нескольких таблиц, см. SheetsManagerPool.
+
+    Все запросы проходят через SheetsRequestScheduler: чтения и записи
+    учитываются в квотах Google Sheets, а записи в таблицу объединяются
+    в один values.batchUpdate.
+
+    Attributes:
+        table_id (str): ID Google-таблицы для работы.
+        scheduler (SheetsRequestScheduler): Планировщик запросов с учетом квот.
+        partner_index (PartnerIndex): Привязка партнеров таблицы к номерам строк.
+        writer (SheetDiffWriter): Запись только изменившихся значений таблицы.
+    """
+
+    def __init__(self, table_id, max_workers=4, scheduler=None, executor=None):
+        """Инициализирует AsyncGoogleSheetsManager.
+
+        Args:
+            table_id (str): ID Google-таблицы для работы.
+            max_workers (int, optional): Количество потоков собственного пула,
+                если executor не передан. Defaults to 4.
+            scheduler (SheetsRequestScheduler, optional): Планировщик, общий для всех
+                таблиц одного сервисного аккаунта. По умолчанию создается собственный.
+            executor (SheetsExecutor, optional): Общий пул потоков. По умолчанию
+                создается собственный, который закрывается в close.
+        """
+        self.table_id = table_id
+        self.scheduler = scheduler or SheetsRequestScheduler()
+        self._owns_executor = executor is None
+        self._executor = executor or SheetsExecutor(max_workers)
+        self.partner_index = PartnerIndex()
+        self.writer = SheetDiffWriter(self)
+
+    async def _run(self, method: str, *args, **kwargs):
+        """Выполняет метод GoogleSheetsManager в пуле потоков.
+
+        Args:
+            method: Название метода GoogleSheetsManager.
+            *args: Позиционные аргументы метода.
+            **kwargs: Именованные аргументы метода.
+
+        Returns:
+            Any: Результат метода.
+        """
+        return await self._executor.run(self.table_id, method, *args, **kwargs)
+
+    async def _read(self, method: str, *args):
+        """Выполняет читающий метод GoogleSheetsManager через планировщик.
+
+        Время с учетом ожидания квоты учитывается в этапе sheet_read
+        текущего PhaseTimer.
+
+        Args:
+            method: Название метода GoogleSheetsManager.
+            *args: Позиционные аргументы метода.
+
+        Returns:
+            Any: Результат метода.
+        """
+        with phase("sheet_read"):
+            return await self.scheduler.submit(lambda: self._run(method, *args))
+
+    async def warm_up(self) -> None:
+        """Заранее создает сервисы в потоках пула и получает токен доступа.
+
+        Предназначен для запуска в фоне после старта бота, чтобы первая
+        команда не тратила время на импорт библиотек Google, сборку сервиса
+        и авторизацию.
+        """
+        await self._executor.warm_up()
+
+    def close(self) -> None:
+        """Останавливает собственный пул потоков, дожидаясь текущих запросов."""
+        if self._owns_executor:
+            self._executor.close()
+
+    async def insert_headers(self, sheet: str, values: list[str]) -> None:
+        """Асинхронная версия GoogleSheetsManager.insert_headers."""
+        await self.batch_update_values({sheet + "!A1": values})
+
+    async def make_headers(self) -> None:
+        """Асинхронная версия GoogleSheetsManager.make_headers.
+
+        Заголовки всех листов записываются одним запросом.
+        """
+        await self.batch_update_values({
+            sheet + "!A1": values
+            for sheet, values in GoogleSheetsManager.HEADERS.items()
+        })
+
+    async def create_sheets(self, sheets: list[str]) -> None:
+        """Асинхронная версия GoogleSheetsManager.create_sheets."""
+        with phase("sheet_write"):
+            return await self.scheduler.submit(
+                lambda: self._run("create_sheets", sheets), reads=1, writes=1)
+
+    async def batch_get_values(self, ranges: list[str]) -> list[list[list]]:
+        """Асинхронная версия GoogleSheetsManager.batch_get_values."""
+        return await self._read("batch_get_values", ranges)
+
+    async def batch_update_values(self, data: dict[str, list[list]]) -> dict:
+        """Асинхронная версия GoogleSheetsManager.batch_update_values.
+
+        Записи, ожидающие отправки в эту же таблицу, объединяются с data
+        в один запрос. Время до записи учитывается в этапе sheet_write
+        текущего PhaseTimer.
+        """
+        with phase("sheet_write"):
+            return await self.scheduler.write_values(
+                self.table_id, data,
+                lambda merged: self._run("batch_update_values", merged))
+
+    async def get_partners(self) -> list[list[str]]:
+        """Асинхронная версия GoogleSheetsManager.get_partners."""
+        return await self._read("get_partners")
+
+    async def get_event_rows(self) -> list[list[str]]:
+        """Асинхронная версия GoogleSheetsManager.get_event_rows."""
+        return await self._read("get_event_rows")
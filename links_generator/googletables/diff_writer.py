@@ -0,0 +1,111 @@
+def changed_ranges(old: list, new: list) -> list[tuple[int, list]]:
+    """Находит непрерывные участки столбца, которые отличаются от прежнего состояния.
+
+    Если новый столбец короче прежнего, лишние ячейки заменяются пустыми строками.
+
+    Args:
+        old: Прежние значения столбца.
+        new: Новые значения столбца.
+
+    Returns:
+        list[tuple[int, list]]: Пары (смещение начала участка, значения участка).
+
+    Examples:
+        >>> changed_ranges([1, 2, 3, 4], [1, 5, 6, 4, 7])
+        [(1, [5, 6]), (4, [7])]
+    """
+    length = max(len(old), len(new))
+    old = list(old) + [""] * (length - len(old))
+    new = list(new) + [""] * (length - len(new))
+
+    runs = []
+    start = None
+    for i in range(length + 1):
+        differs = i < length and old[i] != new[i]
+        if differs and start is None:
+            start = i
+        elif not differs and start is not None:
+            runs.append((start, new[start:i]))
+            start = None
+    return runs
+
+
+class SheetDiffWriter:
+    """Запись столбцов таблицы с отправкой только изменившихся ячеек.
+
+    Хранит последнее записанное состояние каждого столбца и при следующей
+    записи отправляет одним batchUpdate только те диапазоны, значения в
+    которых изменились. Первая запись столбца отправляется целиком.
+
+    Note:
+        Состояние отражает только записи через этот объект. Если таблицу
+        редактировали вручную, нужно вызвать reset().
+    """
+
+    def __init__(self, google_worker, start_row=2):
+        """Инициализирует SheetDiffWriter.
+
+        Args:
+            google_worker: Экземпляр AsyncGoogleSheetsManager для работы с таблицами
+            start_row (int, optional): Номер строки, с которой начинаются данные. Defaults to 2.
+        """
+        self._google_worker = google_worker
+        self._start_row = start_row
+        self._state = {}
+
+    def reset(self, sheet=None) -> None:
+        """Забывает записанное состояние, чтобы следующая запись была полной.
+
+        Args:
+            sheet (str, optional): Лист, состояние которого нужно сбросить.
+                По умолчанию сбрасывается состояние всех листов.
+        """
+        if sheet is None:
+            self._state.clear()
+        else:
+            for key in [key for key in self._state if key[0] == sheet]:
+                del self._state[key]
+
+    def diff(self, sheet: str, columns: dict[str, list]) -> dict[str, list[list]]:
+        """Вычисляет диапазоны, которые нужно записать.
+
+        Args:
+            sheet: Название листа.
+            columns: Словарь {буква столбца: значения начиная со start_row}.
+
+        Returns:
+            dict[str, list[list]]: Словарь {диапазон в A1-нотации: строки значений}.
+        """
+        data = {}
+        for column, values in columns.items():
+            old = self._state.get((sheet, column))
+            runs = [(0, list(values))] if old is None else changed_ranges(old, values)
+            for offset, run in runs:
+                if not run:
+                    continue
+                first = self._start_row + offset
+                last = first + len(run) - 1
+                data[f"{sheet}!{column}{first}:{column}{last}"] = [[value] for value in run]
+        return data
+
+    async def write_columns(self, sheet: str, columns: dict[str, list]) -> dict | None:
+        """Записывает столбцы листа, отправляя только изменившиеся ячейки.
+
+        Args:
+            sheet: Название листа.
+            columns: Словарь {буква столбца: значения начиная со start_row}.
+
+        Returns:
+            dict | None: Ответ API Google Sheets или None, если изменений нет.
+
+        Raises:
+            googleapiclient.errors.HttpError: При ошибках API. Состояние в этом
+                случае не обновляется.
+        """
+        data = self.diff(sheet, columns)
+        result = None
+        if data:
+            result = await self._google_worker.batch_update_values(data)
+        for column, values in columns.items():
+            self._state[(sheet, column)] = list(values)
+        return result
@@ -0,0 +1,206 @@
+def row_ranges(sheet: str, column: str, values_by_row: dict[int, object]) -> dict[str, list[list]]:
+    """Группирует значения по непрерывным диапазонам строк одного столбца.
+
+    Args:
+        sheet: Название листа.
+        column: Буква столбца.
+        values_by_row: Словарь {номер строки: значение}.
+
+    Returns:
+        dict[str, list[list]]: Словарь {диапазон в A1-нотации: строки значений},
+            пригодный для batch_update_values.
+
+    Examples:
+        >>> row_ranges("Лист", "C", {2: "a", 3: "b", 7: "c"})
+        {'Лист!C2:C3': [['a'], ['b']], 'Лист!C7:C7': [['c']]}
+    """
+    data = {}
+    rows = sorted(values_by_row)
+    start = 0
+    for i in range(1, len(rows) + 1):
+        if i == len(rows) or rows[i] != rows[i - 1] + 1:
+            first, last = rows[start], rows[i - 1]
+            data[f"{sheet}!{column}{first}:{column}{last}"] = [
+                [values_by_row[row]] for row in rows[start:i]]
+            start = i
+    return data
+
+
+class PartnerEntry:
+    """Строка листа 'Текущее мероприятие', привязанная к номеру строки.
+
+    Attributes:
+        row (int): Номер строки в таблице.
+        name (str): Название партнера (столбец A).
+        abbreviation (str): Аббревиатура партнера (столбец B).
+        short_link (str): Короткая ссылка для партнера (столбец C).
+    """
+
+    FIELDS = ("name", "abbreviation", "short_link")
+    """tuple[str]: Поля записи в порядке столбцов A, B, C."""
+
+    def __init__(self, row, name="", abbreviation="", short_link=""):
+        """Инициализирует запись.
+
+        Args:
+            row (int): Номер строки в таблице.
+            name (str, optional): Название партнера.
+            abbreviation (str, optional): Аббревиатура партнера.
+            short_link (str, optional): Короткая ссылка для партнера.
+        """
+        self.row = row
+        self.name = name
+        self.abbreviation = abbreviation
+        self.short_link = short_link
+
+    def __repr__(self):
+        return (f"PartnerEntry(row={self.row}, name={self.name!r}, "
+                f"abbreviation={self.abbreviation!r}, short_link={self.short_link!r})")
+
+
+class PartnerIndex:
+    """Индекс партнеров текущего мероприятия с привязкой к номерам строк.
+
+    Пустые строки не выбрасываются: каждая запись помнит свою строку
+    таблицы, поэтому чтение, запросы статистики и запись результатов
+    адресуют одни и те же строки.
+    Индекс обновляется инкрементально — методы sync_* меняют только
+    отличающиеся записи и возвращают номера изменившихся строк.
+
+    Attributes:
+        start_row (int): Номер первой строки данных (после заголовка).
+    """
+
+    def __init__(self, start_row=2):
+        """Инициализирует пустой индекс.
+
+        Args:
+            start_row (int, optional): Номер первой строки данных. Defaults to 2.
+        """
+        self.start_row = start_row
+        self._entries = {}
+        self._extent = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _sync(self, values: list[list], fields: tuple) -> set[int]:
+        """Обновляет указанные поля записей по строкам таблицы.
+
+        Args:
+            values: Строки таблицы начиная со start_row, как их возвращает API.
+            fields: Поля записи в порядке столбцов values.
+
+        Returns:
+            set[int]: Номера строк, в которых изменилось хотя бы одно поле.
+        """
+        changed = set()
+        rows = set()
+        for offset, raw in enumerate(values):
+            cells = [cell.strip() for cell in (list(raw) + [""] * len(fields))[:len(fields)]]
+            row = self.start_row + offset
+            if not any(cells):
+                continue
+            rows.add(row)
+            entry = self._entries.setdefault(row, PartnerEntry(row))
+            for field, cell in zip(fields, cells):
+                if getattr(entry, field) != cell:
+                    setattr(entry, field, cell)
+                    changed.add(row)
+
+        # Строки, которые опустели или пропали из таблицы
+        for row in [row for row in self._entries if row not in rows]:
+            entry = self._entries[row]
+            for field in fields:
+                if getattr(entry, field):
+                    setattr(entry, field, "")
+                    changed.add(row)
+            if not any(getattr(entry, field) for field in PartnerEntry.FIELDS):
+                del self._entries[row]
+
+        self._extent = max(self._extent, len(values))
+        return changed
+
+    def sync_partners(self, values: list[list]) -> set[int]:
+        """Обновляет названия и аббревиатуры по строкам листа 'Активные партнеры'.
+
+        Args:
+            values: Строки столбцов A:B (или шире) начиная со start_row.
+
+        Returns:
+            set[int]: Номера изменившихся строк.
+        """
+        return self._sync([row[:2] for row in values], ("name", "abbreviation"))
+
+    def sync_event(self, values: list[list]) -> set[int]:
+        """Обновляет индекс по строкам листа 'Текущее мероприятие'.
+
+        Args:
+            values: Строки столбцов A:C начиная со start_row.
+
+        Returns:
+            set[int]: Номера изменившихся строк.
+        """
+        return self._sync(values, PartnerEntry.FIELDS)
+
+    def set_short_link(self, row: int, short_link: str) -> None:
+        """Запоминает короткую ссылку для строки.
+
+        Args:
+            row: Номер строки в таблице.
+            short_link: Короткая ссылка или пустая строка.
+        """
+        entry = self._entries.setdefault(row, PartnerEntry(row))
+        entry.short_link = short_link
+        if not any(getattr(entry, field) for field in PartnerEntry.FIELDS):
+            del self._entries[row]
+
+    def entries(self) -> list[PartnerEntry]:
+        """Возвращает все записи индекса в порядке строк.
+
+        Returns:
+            list[PartnerEntry]: Записи индекса.
+        """
+        return [self._entries[row] for row in sorted(self._entries)]
+
+    def with_abbreviation(self) -> list[PartnerEntry]:
+        """Возвращает записи, для которых задана аббревиатура.
+
+        Returns:
+            list[PartnerEntry]: Записи в порядке строк.
+        """
+        return [entry for entry in self.entries() if entry.abbreviation]
+
+    def with_short_link(self) -> list[PartnerEntry]:
+        """Возвращает записи, для которых задана короткая ссылка.
+
+        Returns:
+            list[PartnerEntry]: Записи в порядке строк.
+        """
+        return [entry for entry in self.entries() if entry.short_link]
+
+    def column(self, values_by_row: dict[int, object]) -> list:
+        """Разворачивает значения по строкам в столбец, выровненный по строкам таблицы.
+
+        Строки без значения заполняются пустыми строками, поэтому столбец
+        можно записывать начиная со start_row без сдвига.
+
+        Args:
+            values_by_row: Словарь {номер строки: значение}.
+
+        Returns:
+            list: Значения для строк start_row … start_row + длина - 1.
+        """
+        length = max([self._extent] + [row - self.start_row + 1 for row in values_by_row])
+        return [values_by_row.get(self.start_row + offset, "") for offset in range(length)]
+
+    def field_column(self, field: str) -> list:
+        """Возвращает выровненный по строкам столбец одного поля записей.
+
+        Args:
+            field: Название поля PartnerEntry.
+
+        Returns:
+            list: Значения поля для строк начиная со start_row.
+        """
+        return self.column({entry.row: getattr(entry, field) for entry in self.entries()})
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+
+from .async_worktables import AsyncGoogleSheetsManager, SheetsExecutor
+from .scheduler import SheetsRequestScheduler
+
+
+class SheetsManagerPool:
+    """Ограниченный пул менеджеров Google-таблиц с вытеснением LRU.
+
+    Позволяет одному процессу бота обслуживать несколько таблиц: чаты
+    привязываются к таблицам в базе данных, а менеджер нужной таблицы
+    берется из пула. Все менеджеры используют общий пул потоков с одним
+    сервисом Google Sheets на поток и общий планировщик квот, поэтому
+    новая таблица не требует отдельного discovery-клиента. При превышении
+    max_size вытесняется таблица, к которой дольше всего не обращались;
+    таблица по умолчанию не вытесняется.
+
+    Attributes:
+        default_table_id (str): ID таблицы для чатов без привязки.
+        max_size (int): Максимальное количество менеджеров в пуле.
+        scheduler (SheetsRequestScheduler): Планировщик запросов, общий для всех таблиц.
+    """
+
+    def __init__(self, default_table_id, max_size=16, max_workers=4, scheduler=None):
+        """Инициализирует пул.
+
+        Args:
+            default_table_id (str): ID таблицы для чатов без привязки.
+            max_size (int, optional): Максимальное количество менеджеров. Defaults to 16.
+            max_workers (int, optional): Количество потоков общего пула. Defaults to 4.
+            scheduler (SheetsRequestScheduler, optional): Общий планировщик запросов.
+                По умолчанию создается собственный.
+        """
+        self.default_table_id = default_table_id
+        self.max_size = max_size
+        self.scheduler = scheduler or SheetsRequestScheduler()
+        self._executor = SheetsExecutor(max_workers)
+        self._managers = OrderedDict()
+
+    def __len__(self):
+        return len(self._managers)
+
+    def get(self, table_id=None) -> AsyncGoogleSheetsManager:
+        """Возвращает менеджер таблицы, создавая его при необходимости.
+
+        Args:
+            table_id (str, optional): ID Google-таблицы. По умолчанию default_table_id.
+
+        Returns:
+            AsyncGoogleSheetsManager: Менеджер таблицы.
+        """
+        table_id = table_id or self.default_table_id
+        manager = self._managers.get(table_id)
+        if manager is not None:
+            self._managers.move_to_end(table_id)
+            return manager
+
+        manager = AsyncGoogleSheetsManager(
+            table_id, scheduler=self.scheduler, executor=self._executor)
+        self._managers[table_id] = manager
+        self._evict()
+        return manager
+
+    async def for_chat(self, chat_id: int, db_worker) -> AsyncGoogleSheetsManager:
+        """Возвращает менеджер таблицы, привязанной к чату.
+
+        Args:
+            chat_id (int): Telegram ID чата.
+            db_worker: Экземпляр AsyncDatabaseManager с привязками чатов к таблицам.
+
+        Returns:
+            AsyncGoogleSheetsManager: Менеджер привязанной таблицы или таблицы по умолчанию.
+        """
+        return self.get(await db_worker.get_spreadsheet(chat_id))
+
+    def _evict(self) -> None:
+        """Вытесняет давно не использованные таблицы сверх max_size."""
+        for table_id in list(self._managers):
+            if len(self._managers) <= self.max_size:
+                return
+            if table_id == self.default_table_id:
+                continue
+            del self._managers[table_id]
+            self._executor.forget(table_id)
+
+    async def warm_up(self) -> None:
+        """Заранее собирает сервисы в потоках пула и получает токен доступа."""
+        await self._executor.warm_up()
+
+    def close(self) -> None:
+        """Останавливает общий пул потоков, дожидаясь текущих запросов."""
+        self._executor.close()
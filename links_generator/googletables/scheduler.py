@@ -0,0 +1,191 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+from links_generator.singleflight import KeyedLocks
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Проверяет, что ошибка Google API вызвана превышением квоты (HTTP 429).
+
+    Args:
+        error: Исключение, возникшее при запросе.
+
+    Returns:
+        bool: True, если сервер ответил статусом 429.
+    """
+    status = getattr(getattr(error, "resp", None), "status", None)
+    return str(status) == "429"
+
+
+class SheetsRequestScheduler:
+    """Планировщик запросов к Google Sheets с учетом квот на чтение и запись.
+
+    Google Sheets ограничивает количество запросов на чтение и на запись
+    в минуту. Планировщик ведет скользящие окна для обеих квот и задерживает
+    запросы, которые бы их превысили. Ожидающие записи в одну таблицу
+    объединяются в один values.batchUpdate, а записи в одну таблицу
+    отправляются строго по очереди. При ответе 429 все запросы
+    приостанавливаются с экспоненциальной задержкой и повторяются.
+
+    Attributes:
+        read_limit (int): Допустимое количество запросов на чтение за окно.
+        write_limit (int): Допустимое количество запросов на запись за окно.
+        window (float): Длина окна в секундах.
+        max_retries (int): Максимальное количество повторов после ответа 429.
+    """
+
+    def __init__(self, read_limit=60, write_limit=60, window=60.0, max_retries=5):
+        """Инициализирует планировщик.
+
+        Args:
+            read_limit (int, optional): Квота на чтение за окно. Defaults to 60.
+            write_limit (int, optional): Квота на запись за окно. Defaults to 60.
+            window (float, optional): Длина окна в секундах. Defaults to 60.0.
+            max_retries (int, optional): Максимальное количество повторов. Defaults to 5.
+        """
+        self.read_limit = read_limit
+        self.write_limit = write_limit
+        self.window = window
+        self.max_retries = max_retries
+        self._sent = {"read": deque(), "write": deque()}
+        self._locks = {"read": asyncio.Lock(), "write": asyncio.Lock()}
+        self._paused_until = 0.0
+        self._pending_writes = {}
+        self._flush_tasks = set()
+        self._write_locks = KeyedLocks()
+
+    async def _acquire(self, kind: str) -> None:
+        """Ожидает свободное место в квоте и занимает его.
+
+        Args:
+            kind: Тип квоты: 'read' или 'write'.
+        """
+        limit = self.read_limit if kind == "read" else self.write_limit
+        sent = self._sent[kind]
+        async with self._locks[kind]:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                while sent and now - sent[0] >= self.window:
+                    sent.popleft()
+                if len(sent) < limit:
+                    sent.append(now)
+                    return
+                await asyncio.sleep(sent[0] + self.window - now)
+
+    def _pause(self, attempt: int) -> None:
+        """Приостанавливает все запросы после ответа 429.
+
+        Args:
+            attempt: Номер неудачной попытки, начиная с 0.
+        """
+        delay = min(60.0, 2 ** attempt) + random.uniform(0, 1)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    async def submit(self, call, reads=1, writes=0):
+        """Выполняет запрос с учетом квот и повтором после ответа 429.
+
+        Args:
+            call: Функция без аргументов, возвращающая корутину запроса.
+            reads (int, optional): Количество запросов на чтение внутри call. Defaults to 1.
+            writes (int, optional): Количество запросов на запись внутри call. Defaults to 0.
+
+        Returns:
+            Any: Результат call.
+
+        Raises:
+            Exception: Ошибка call, если она не связана с квотой или повторы исчерпаны.
+        """
+        for attempt in range(self.max_retries + 1):
+            for _ in range(reads):
+                await self._acquire("read")
+            for _ in range(writes):
+                await self._acquire("write")
+            try:
+                return await call()
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                self._pause(attempt)
+
+    async def write_values(self, key: str, data: dict, flush) -> dict:
+        """Ставит запись диапазонов в очередь с объединением по таблице.
+
+        Все записи с одинаковым key, накопившиеся к моменту отправки,
+        отправляются одним вызовом flush. Если несколько записей затрагивают
+        один диапазон, побеждает последняя.
+
+        Args:
+            key: Идентификатор таблицы.
+            data: Словарь {диапазон в A1-нотации: строки значений}.
+            flush: Функция, принимающая объединенный словарь и возвращающая
+                корутину запроса values.batchUpdate.
+
+        Returns:
+            dict: Ответ общего запроса values.batchUpdate.
+        """
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending_writes.setdefault(key, [])
+        pending.append((data, future))
+        if len(pending) == 1:
+            task = asyncio.create_task(self._flush_writes(key, flush))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        return await future
+
+    async def _flush_writes(self, key: str, flush) -> None:
+        """Отправляет накопленные записи одной таблицы.
+
+        Пока предыдущая отправка в ту же таблицу не завершилась, новые
+        записи накапливаются и уходят следующим запросом. Если отправка
+        прервана, например отменой задачи, ожидающие ее записи отменяются,
+        а не зависают.
+
+        Args:
+            key: Идентификатор таблицы.
+            flush: Функция отправки объединенного словаря.
+        """
+        batch = None
+        try:
+            async with self._write_locks.hold(key):
+                await self._acquire("write")
+                batch = self._pending_writes.pop(key, [])
+                await self._send_writes(batch, flush)
+        finally:
+            if batch is None:
+                batch = self._pending_writes.pop(key, [])
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    async def _send_writes(self, batch: list, flush) -> None:
+        """Объединяет записи и отправляет их с повторами.
+
+        Args:
+            batch: Список пар (словарь диапазонов, future ожидающего вызова).
+            flush: Функция отправки объединенного словаря.
+        """
+        merged = {}
+        for data, _ in batch:
+            merged.update(data)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await flush(merged)
+                break
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    return
+                self._pause(attempt)
+                await self._acquire("write")
+
+        for _, future in batch:
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,103 @@
+import datetime
+import threading
+
+import httplib2
+import requests
+from google.auth.transport.requests import AuthorizedSession, Request
+from requests.adapters import HTTPAdapter
+
+
+class PooledHttp:
+    """HTTP-транспорт для googleapiclient с пулом постоянных соединений.
+
+    Совместим с интерфейсом httplib2.Http, который ожидает googleapiclient,
+    но отправляет запросы через requests.Session с пулом keep-alive
+    соединений. Токен сервисного аккаунта обновляется заранее, до истечения
+    срока действия, а ответы запрашиваются в сжатом gzip виде.
+
+    Note:
+        Экземпляр не потокобезопасен: каждому потоку нужен собственный транспорт.
+
+    Attributes:
+        credentials (google.auth.credentials.Credentials): Учетные данные сервисного аккаунта.
+        refresh_margin (datetime.timedelta): За сколько до истечения обновлять токен.
+        timeout (float): Таймаут запроса в секундах.
+    """
+
+    USER_AGENT = "links-generator (gzip)"
+    """str: User-Agent со словом gzip — без него Google API не сжимает ответы."""
+
+    def __init__(self, credentials, pool_size=10, refresh_margin=300, timeout=60):
+        """Инициализирует транспорт.
+
+        Args:
+            credentials: Учетные данные сервисного аккаунта.
+            pool_size (int, optional): Максимум соединений в пуле. Defaults to 10.
+            refresh_margin (float, optional): За сколько секунд до истечения
+                обновлять токен. Defaults to 300.
+            timeout (float, optional): Таймаут запроса в секундах. Defaults to 60.
+        """
+        self.credentials = credentials
+        self.refresh_margin = datetime.timedelta(seconds=refresh_margin)
+        self.timeout = timeout
+        self._session = AuthorizedSession(credentials)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        # Токен запрашивается без авторизации: через AuthorizedSession запрос
+        # к token endpoint сам вызвал бы обновление токена
+        self._token_session = requests.Session()
+        self._refresh_lock = threading.Lock()
+
+    def ensure_fresh_token(self) -> None:
+        """Обновляет токен, если он отсутствует или скоро истечет.
+
+        Raises:
+            google.auth.exceptions.RefreshError: Если токен получить не удалось
+        """
+        expiry = self.credentials.expiry
+        # google-auth хранит expiry как naive datetime в UTC
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        if self.credentials.token and expiry and expiry - now > self.refresh_margin:
+            return
+        with self._refresh_lock:
+            expiry = self.credentials.expiry
+            if not self.credentials.token or not expiry or expiry - now <= self.refresh_margin:
+                self.credentials.refresh(Request(self._token_session))
+
+    def request(self, uri, method="GET", body=None, headers=None,
+                redirections=5, connection_type=None):
+        """Выполняет HTTP-запрос в формате httplib2.Http.request.
+
+        Args:
+            uri (str): Адрес запроса.
+            method (str, optional): HTTP-метод. Defaults to 'GET'.
+            body (str | bytes, optional): Тело запроса.
+            headers (dict, optional): Заголовки запроса.
+            redirections (int, optional): Не используется, оставлен для совместимости.
+            connection_type: Не используется, оставлен для совместимости.
+
+        Returns:
+            tuple[httplib2.Response, bytes]: Ответ и его распакованное тело.
+        """
+        self.ensure_fresh_token()
+        headers = dict(headers or {})
+        headers["accept-encoding"] = "gzip"
+        headers["user-agent"] = " ".join(
+            filter(None, [headers.get("user-agent"), self.USER_AGENT]))
+
+        response = self._session.request(
+            method, uri, data=body, headers=headers, timeout=self.timeout)
+
+        info = {key.lower(): value for key, value in response.headers.items()}
+        # requests уже распаковал тело, исходная длина и кодировка неактуальны
+        info.pop("content-encoding", None)
+        info.pop("content-length", None)
+        info["status"] = str(response.status_code)
+        result = httplib2.Response(info)
+        result.reason = response.reason
+        return result, response.content
+
+    def close(self) -> None:
+        """Закрывает соединения пула."""
+        self._session.close()
+        self._token_session.close()
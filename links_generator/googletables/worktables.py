@@ -1,7 +1,3 @@
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-
-
 class GoogleSheetsManager:
     """Класс для работы с Google Таблицами.
 
@@ -20,18 +16,61 @@ class GoogleSheetsManager:
         service (Resource): Объект сервиса Google Sheets API.
     """
 
-    def __init__(self, table_id):
+    HEADERS = {
+        "Текущее мероприятие": [
+            ["Партнер", "Аббревиатура", "Ссылка для партнера",
+                "Пост отправлен", "Пост опубликован", "Количество переходов"],
+        ],
+        "Аналитика переходов": [
+            ["Партнер", "Количество переходов"],
+        ],
+        "Активные партнеры": [
+            ["Партнер", "Аббревиатура", "Ссылка на партнера",
+             "Контактное лицо", "Ответственный"],
+        ],
+    }
+    """dict[str, list[list[str]]]: Стандартные заголовки листов таблицы."""
+
+    def __init__(self, table_id, shared=None):
         """Инициализирует GoogleSheetsManager с авторизацией через сервисный аккаунт.
 
+        Библиотеки Google импортируются здесь, а не на уровне модуля, чтобы
+        импорт пакета не замедлял запуск бота. Сервис собирается из
+        статического discovery-документа, поставляемого с googleapiclient,
+        без сетевого запроса. Запросы идут через PooledHttp: постоянные
+        соединения, заблаговременное обновление токена и сжатие ответов.
+
         Args:
             table_id (str): ID Google-таблицы для работы
+            shared (GoogleSheetsManager, optional): Менеджер, сервис и HTTP-клиент
+                которого переиспользуются вместо создания собственных. Оба
+                менеджера должны использоваться из одного потока.
         """
         self._SPREADSHEET_ID = table_id
+        if shared is not None:
+            self._http = shared._http
+            self._service = shared._service
+            return
+
+        from google.oauth2.service_account import Credentials
+        from googleapiclient.discovery import build
+        from .transport import PooledHttp
+
         credentials = Credentials.from_service_account_file(
             "credentials.json",
             scopes=["https://www.googleapis.com/auth/spreadsheets"],
         )
-        self._service = build("sheets", "v4", credentials=credentials)
+        self._http = PooledHttp(credentials)
+        self._service = build("sheets", "v4", http=self._http,
+                              static_discovery=True, cache_discovery=False)
+
+    def warm_up(self) -> None:
+        """Заранее получает токен доступа сервисного аккаунта.
+
+        Raises:
+            google.auth.exceptions.RefreshError: Если токен получить не удалось
+        """
+        self._http.ensure_fresh_token()
 
     def insert_headers(self, sheet: str, values: list[str]) -> None:
         """Вставляет заголовки в указанный лист таблицы.
@@ -71,24 +110,8 @@ class GoogleSheetsManager:
         Raises:
             googleapiclient.errors.HttpError: При ошибках API
         """
-        event_sheet = "Текущее мероприятие"
-        analytics_sheet = "Аналитика переходов"
-        partners_sheet = "Активные партнеры"
-        values_event = [
-            ["Партнер", "Аббревиатура", "Ссылка для партнера",
-                "Пост отправлен", "Пост опубликован", "Количество переходов"],
-        ]
-        values_analytics = [
-            ["Партнер", "Количество переходов"],
-        ]
-        values_partners = [
-            ["Партнер", "Аббревиатура", "Ссылка на партнера",
-             "Контактное лицо", "Ответственный"],
-        ]
-
-        self.insert_headers(event_sheet, values_event)
-        self.insert_headers(analytics_sheet, values_analytics)
-        self.insert_headers(partners_sheet, values_partners)
+        for sheet, values in self.HEADERS.items():
+            self.insert_headers(sheet, values)
 
     def create_sheets(self, sheets: list[str]) -> None:
         """Создает новые листы в таблице, если они не существуют.
@@ -123,128 +146,108 @@ class GoogleSheetsManager:
                 body=request,
             ).execute()
 
-    def get_short_names(self) -> list[list]:
-        """Возвращает все аббревиатуры партнеров из листа 'Активные партнеры', исключая заголовок.
+    def batch_get_values(self, ranges: list[str]) -> list[list[list]]:
+        """Читает несколько диапазонов таблицы одним запросом values.batchGet.
+
+        Args:
+            ranges: Список диапазонов в A1-нотации.
 
         Returns:
-            list[list]: Список списков строк, где каждая строка - аббревиатура партнера.
-                        Возвращает пустой список, если нет данных или произошла ошибка.
+            list[list[list]]: Значения каждого диапазона в порядке ranges.
 
-        Examples:
-            >>> manager.get_active_events()
-            [['part1', ], ['part2', ]]
+        Raises:
+            googleapiclient.errors.HttpError: При ошибках API
         """
-        try:
-            # Получаем все данные с листа (начиная с первой строки)
-            result = (
-                self._service.spreadsheets()
-                .values()
-                .get(
-                    spreadsheetId=self._SPREADSHEET_ID,
-                    range="Активные партнеры!B:B"
-                )
-                .execute()
+        result = (
+            self._service.spreadsheets()
+            .values()
+            .batchGet(
+                spreadsheetId=self._SPREADSHEET_ID,
+                ranges=ranges,
             )
+            .execute()
+        )
+        return [value_range.get("values", [])
+                for value_range in result.get("valueRanges", [])]
 
-            values = result.get('values', [])
-
-            if len(values) > 1:
-                # Фильтруем непустые строки (исключая заголовок)
-                non_empty_rows = [
-                    row for row in values[1:]
-                    if any(cell.strip() for cell in row)
-                ]
-                return non_empty_rows
-
-            return []
-
-        except Exception as e:
-            print(f"Ошибка при получении аббревиатур партнеров: {str(e)}")
-            return []
-
-    def insert_event_table(self, column: str, values: list[str]) -> dict:
-        """Вставляет значения в столбец column листа 'Текущее мероприятие'.
+    def batch_update_values(self, data: dict[str, list[list]]) -> dict:
+        """Записывает несколько диапазонов таблицы одним запросом values.batchUpdate.
 
         Args:
-            column: Буква столбца (A-Z)
-            values: Список значений для вставки
+            data: Словарь {диапазон в A1-нотации: строки значений}.
 
         Returns:
             dict: Ответ API Google Sheets с результатами операции
 
         Raises:
-            ValueError: Если values пуст или column некорректен
             googleapiclient.errors.HttpError: При ошибках API
-
-        Example:
-            >>> manager.insert_event_table("C", ["link1", "link2"])
-            {'spreadsheetId': '...', 'updatedCells': 2, ...}
         """
-        if not values:
-            raise ValueError("Список значений не может быть пустым")
-
-        try:
-            # Формируем тело запроса
-            body = {
-                # Каждое значение в отдельный список (отдельная строка)
-                "values": [[value] for value in values]
-            }
-
-            # Выполняем запрос к API
-            result = (
-                self._service.spreadsheets()
-                .values()
-                .update(
-                    spreadsheetId=self._SPREADSHEET_ID,
-                    range=f"Текущее мероприятие!{column}2:{column}",
-                    valueInputOption="RAW",
-                    body=body,
-                )
-                .execute()
+        body = {
+            "valueInputOption": "RAW",
+            "data": [{"range": range_, "values": values}
+                     for range_, values in data.items()],
+        }
+        return (
+            self._service.spreadsheets()
+            .values()
+            .batchUpdate(
+                spreadsheetId=self._SPREADSHEET_ID,
+                body=body,
             )
+            .execute()
+        )
 
-            return result
-
-        except Exception as e:
-            print(f"Ошибка при вставке значений: {str(e)}")
-            raise
+    def get_partners(self) -> list[list[str]]:
+        """Возвращает данные партнеров (столбцы A:E) из листа 'Активные партнеры'.
 
-    def get_partner_links(self) -> list[list]:
-        """Возвращает все ссылки партнеров из столбца C листа 'Текущее мероприятие', исключая заголовок.
+        Пустые строки сохраняются, чтобы i-й элемент соответствовал строке
+        i + 2 таблицы, недостающие ячейки дополняются пустыми строками.
 
         Returns:
-            list[list]: Список списков, где каждый внутренний список содержит одну ссылку.
-                        Возвращает пустой список, если нет данных или произошла ошибка.
+            list[list[str]]: Список строк вида [партнер, аббревиатура, ссылка на партнера,
+                контактное лицо, ответственный], начиная со второй строки листа.
+
+        Raises:
+            googleapiclient.errors.HttpError: При ошибках API
 
         Examples:
-            >>> manager.get_partner_links()
-            [['https://example.com/partner1'], 
-            ['https://example.com/partner2'],
-            ['https://example.com/partner3']]
+            >>> manager.get_partners()
+            [['Партнер 1', 'part1', 'https://vk.com/part1', 'Иван', 'Петр']]
         """
-        try:
-            # Получаем данные из столбца C, начиная со 2 строки
-            result = (
-                self._service.spreadsheets()
-                .values()
-                .get(
-                    spreadsheetId=self._SPREADSHEET_ID,
-                    range="Текущее мероприятие!C2:C"  # Столбец C, со 2 строки до конца
-                )
-                .execute()
-            )
+        values = self.batch_get_values(["Активные партнеры!A2:E"])[0]
+        return [(row + [""] * 5)[:5] for row in values]
+
+    def get_event_rows(self) -> list[list[str]]:
+        """Возвращает столбцы A:C листа 'Текущее мероприятие' с сохранением пустых строк.
 
-            values = result.get('values', [])
+        Returns:
+            list[list[str]]: Список строк вида [партнер, аббревиатура, короткая ссылка],
+                начиная со второй строки листа.
 
-            # Фильтруем непустые строки
-            non_empty_links = [
-                # Каждую ссылку помещаем в отдельный список
-                [row[0]] for row in values
-                if row and row[0].strip()    # Проверяем что строка не пустая
-            ]
+        Raises:
+            googleapiclient.errors.HttpError: При ошибках API
+        """
+        values = self.batch_get_values(["Текущее мероприятие!A2:C"])[0]
+        return [(row + [""] * 3)[:3] for row in values]
 
-            return non_empty_links
+    @staticmethod
+    def event_columns_data(columns: dict[str, list]) -> dict[str, list[list]]:
+        """Формирует диапазоны для записи столбцов листа 'Текущее мероприятие'.
 
-        except Exception as e:
-            print(f"Ошибка при получении ссылок партнеров: {str(e)}")
-            return []
+        Args:
+            columns: Словарь {буква столбца: список значений начиная со второй строки}.
+
+        Returns:
+            dict[str, list[list]]: Словарь {диапазон в A1-нотации: строки значений}.
+
+        Raises:
+            ValueError: Если не передано ни одного непустого столбца
+        """
+        data = {
+            f"Текущее мероприятие!{column}2:{column}{len(values) + 1}":
+                [[value] for value in values]
+            for column, values in columns.items() if values
+        }
+        if not data:
+            raise ValueError("Список значений не может быть пустым")
+        return data
@@ -4,6 +4,14 @@ from aiogram import Router
 from aiogram.fsm.context import FSMContext
 from aiogram import F
 from aiogram.filters import BaseFilter
+from links_generator.databases.databases import DatabaseManager
+from links_generator.jobs import STATUS_NAMES
+from links_generator.metrics import HandlerMetricsMiddleware
+from links_generator.timing import TimingMiddleware
+from links_generator.singleflight import SingleFlight
+import csv
+import io
+import time
 
 
 class IsAdminFilter(BaseFilter):
@@ -25,39 +33,69 @@ class IsAdminFilter(BaseFilter):
         Note:
             Для работы требует предварительной инициализации _db_worker.
         """
-        return _db_worker.is_admin(str(message.from_user.id))
+        return await _db_worker.is_admin(message.from_user.id)
 
 
 router = Router()
-_google_worker = None
+IMPORT_MAX_BYTES = 1024 * 1024
+"""int: Максимальный размер CSV-файла для /import_admins."""
+_single_flight = SingleFlight()
+_sheets_pool = None
 _vk_api_worker = None
 _db_worker = None
 _admin_id = None
+_analytics_refresher = None
+_job_queue = None
 
 
-def setup(dp, google_worker, vk_api_worker, db_worker, admin_id):
+def setup(dp, sheets_pool, vk_api_worker, db_worker, admin_id, analytics_refresher,
+          job_queue, slow_threshold=5.0):
     """Инициализирует обработчики команд с зависимостями.
 
-    Устанавливает глобальные экземпляры менеджеров и подключает роутер к диспетчеру.
+    Устанавливает глобальные экземпляры менеджеров, подключает к роутеру
+    middleware с метриками команд и замером времени по этапам и подключает
+    роутер к диспетчеру.
 
     Args:
         dp: Экземпляр Dispatcher из aiogram
-        google_worker: Экземпляр GoogleSheetsManager для работы с таблицами
-        vk_api_worker: Экземпляр VKLinkManager для работы с VK API
-        db_worker: Экземпляр DatabaseManager для работы с БД
+        sheets_pool: Экземпляр SheetsManagerPool с менеджерами Google-таблиц
+        vk_api_worker: Экземпляр AsyncVKLinkManager для работы с VK API
+        db_worker: Экземпляр AsyncDatabaseManager для работы с БД
         admin_id: Телеграм-айди администратора бота
+        analytics_refresher: Экземпляр AnalyticsRefresher с последними снимками аналитики
+        job_queue: Экземпляр JobQueue для фоновой генерации ссылок
+        slow_threshold (float, optional): Порог в секундах, после которого команда
+            записывается в журнал медленных команд. Defaults to 5.0.
     """
-    global _google_worker
-    _google_worker = google_worker
+    global _sheets_pool
+    _sheets_pool = sheets_pool
     global _vk_api_worker
     _vk_api_worker = vk_api_worker
     global _db_worker
     _db_worker = db_worker
     global _admin_id
     _admin_id = admin_id
+    global _analytics_refresher
+    _analytics_refresher = analytics_refresher
+    global _job_queue
+    _job_queue = job_queue
+    router.message.outer_middleware(TimingMiddleware(slow_threshold))
+    router.message.middleware(HandlerMetricsMiddleware())
     dp.include_router(router)
 
 
+async def _google_worker_for(message: Message):
+    """Возвращает менеджер Google-таблицы, привязанной к чату сообщения.
+
+    Args:
+        message: Объект сообщения от пользователя.
+
+    Returns:
+        AsyncGoogleSheetsManager: Менеджер привязанной таблицы или таблицы по умолчанию.
+    """
+    return await _sheets_pool.for_chat(message.chat.id, _db_worker)
+
+
 @router.message(Command(commands=['start']))
 async def process_start_command(
     message: Message,
@@ -75,11 +113,11 @@ async def process_start_command(
         state: Контекст текущего состояния пользователя.
     """
     await state.clear()
-    if not _db_worker.user_exists(message.from_user.id):
+    if not await _db_worker.user_exists(message.from_user.id):
         if _admin_id == str(message.from_user.id):
-            _db_worker.add_user(message.from_user.id, "admin")
+            await _db_worker.add_user(message.from_user.id, "admin")
         else:
-            _db_worker.add_user(message.from_user.id, "user")
+            await _db_worker.add_user(message.from_user.id, "user")
     await message.answer('Привет, я бот для генерации коротких ссылок\n'
                          'Нажми /help, чтобы увидеть мои команды')
 
@@ -102,11 +140,20 @@ async def process_help_command(
     await message.answer(
         '/start - приветственное сообщение\n'
         '/create_links <link> - создание коротких ссылок из ссылки link\n'
-        '/analytics - аналатика переходов по текущим ссылкам в таблице\n'
+        '/create_links_matrix <template> <url> [<url> ...] - ссылки по шаблону UTM-меток '
+        'для нескольких страниц, {abbr} и {name} - поля партнера\n'
+        '/analytics [--fresh] [--no-cache] - аналатика переходов по текущим ссылкам в таблице\n'
         '/myID - получить ваш user ID\n'
-        '/add_admin <user_id> - добавление админа\n'
-        '/remove_admin <user_id> - удаление админа\n'
+        '/add_admin <user_id> [<user_id> ...] - добавление админов\n'
+        '/remove_admin <user_id> [<user_id> ...] - удаление админов\n'
+        '/import_admins - CSV-файл с подписью-командой: строки tg_id[,admin|user]\n'
         '/create_table - создать таблицу по макету\n'
+        '/bind_table <table_id> - привязать чат к Google-таблице\n'
+        '/unbind_table - вернуть чат к таблице по умолчанию\n'
+        '/vk_stats - статистика запросов по ключам VK\n'
+        '/jobs - последние задачи генерации ссылок в этом чате\n'
+        '/job_status <job_id> - ход выполнения задачи\n'
+        '/job_cancel <job_id> - отменить задачу\n'
     )
 
 
@@ -131,7 +178,7 @@ async def process_id_command(
 async def create_table_command(message: Message) -> None:
     """Обрабатывает команду '/create_table' для создания и настройки Google Sheets таблицы.
 
-    Создает новую таблицу с указанными листами и добавляет стандартные заголовки.
+    Создает в таблице, привязанной к чату, стандартные листы и заголовки.
     Отправляет пользователю сообщение об успешном выполнении или об ошибке.
 
     Args:
@@ -142,31 +189,69 @@ async def create_table_command(message: Message) -> None:
             перехватываются и отправляются пользователю в виде сообщения.
 
     Notes:
-        - Требует предварительной инициализации _google_worker.
+        - Требует предварительной инициализации _sheets_pool.
         - Создает три стандартных листа: "Текущее мероприятие", "Аналитика переходов", "Активные партнеры".
     """
-    if _google_worker is None:
+    if _sheets_pool is None:
         await message.answer("Ошибка: сервис Google Sheets не инициализирован")
         return
 
+    google_worker = await _google_worker_for(message)
     try:
         # Создаем листы
         sheets = ["Текущее мероприятие",
                   "Аналитика переходов", "Активные партнеры"]
-        _google_worker.create_sheets(sheets)
+        await google_worker.create_sheets(sheets)
 
         # Добавляем заголовки
-        _google_worker.make_headers()
+        await google_worker.make_headers()
 
         await message.answer("Таблица успешно создана и настроена!")
     except Exception as e:
         await message.answer(f"Ошибка при создании таблицы: {str(e)}")
 
 
+async def _enqueue_job(message: Message, kind: str, params: dict) -> None:
+    """Ставит задачу генерации ссылок в очередь и сообщает ее номер.
+
+    Сообщение о постановке в очередь затем редактируется по ходу
+    выполнения задачи. Если такая же задача для той же таблицы еще не
+    завершена, новая не создается.
+
+    Args:
+        message: Объект сообщения от пользователя.
+        kind: Тип задачи, см. JobQueue.enqueue.
+        params: Параметры задачи.
+    """
+    google_worker = await _google_worker_for(message)
+    try:
+        job_id, created = await _job_queue.enqueue(
+            kind, message.chat.id, google_worker.table_id, params)
+    except ValueError as e:
+        await message.answer(f"Ошибка: {e}")
+        return
+    if not created:
+        await message.answer(f"Такая же задача #{job_id} уже выполняется, "
+                             f"ход выполнения: /job_status {job_id}")
+        return
+    status = await message.answer(f"Задача #{job_id} поставлена в очередь")
+    await _job_queue.set_message(job_id, status.message_id)
+
+
 @router.message(Command("create_links"), IsAdminFilter())
 async def process_create_links(message: Message, command: Command) -> None:
     """Генерирует короткие ссылки для партнеров и сохраняет их в таблицу.
 
+    Названия и аббревиатуры партнеров копируются в столбцы A и B листа
+    'Текущее мероприятие', а ссылки создаются параллельно и записываются
+    в столбец C по частям, см. LinkPipeline. Генерация выполняется как
+    фоновая задача JobQueue и после перезапуска бота продолжается с
+    последней записанной порции. Ход генерации со скоростью и оставшимся
+    временем отображается в одном редактируемом сообщении.
+    Строки листа 'Текущее мероприятие' совпадают со строками листа
+    'Активные партнеры', в том числе для партнеров без аббревиатуры.
+    Используется таблица, привязанная к чату.
+
     Args:
         message: Объект сообщения от пользователя.
         command: Объект команды с аргументами.
@@ -197,145 +282,475 @@ async def process_create_links(message: Message, command: Command) -> None:
             "/create_links <link>"
         )
         return
-    await message.answer("...начинаю генерацию ссылок, подождите...")
-    short_links = [_vk_api_worker.get_short_link(link + "?utm_source=" + item[0])
-                   for item in _google_worker.get_short_names()]
-    _google_worker.insert_event_table("C", short_links)
-    await message.answer(
-        "Ссылка создана!\n"
-        f"Ваша ссылка: {link}"
-    )
+    await _enqueue_job(message, "create_links", {"link": link})
+
+
+@router.message(Command("create_links_matrix"), IsAdminFilter())
+async def process_create_links_matrix(message: Message, command: Command) -> None:
+    """Генерирует короткие ссылки для каждой пары партнер × посадочная страница.
+
+    Первый аргумент — шаблон UTM-меток в формате строки запроса, в котором
+    можно использовать поля партнера {abbr} и {name}. Остальные аргументы —
+    посадочные URL. Метки добавляются к уже имеющимся параметрам URL.
+    Ссылки для каждого URL записываются в отдельный столбец листа
+    'Текущее мероприятие', начиная с jobs.MATRIX_FIRST_COLUMN, а сам URL —
+    в заголовок столбца. Вся матрица сокращается параллельно, см. LinkPipeline,
+    в фоновой задаче, как и в /create_links.
+
+    Args:
+        message: Объект сообщения от пользователя.
+        command: Объект команды с аргументами.
+
+    Notes:
+        Пример использования:
+        /create_links_matrix utm_source={abbr}&utm_medium=partner&utm_campaign=spring https://a.ru https://b.ru/?lang=en
+    """
+    args = command.args.split() if command.args else []
+    usage = ("/create_links_matrix <template> <url> [<url> ...]\n"
+             "Например: /create_links_matrix "
+             "utm_source={abbr}&utm_campaign=spring https://example.com")
+    if len(args) < 2:
+        await message.answer("Ошибка: Неверный ввод команды. Пример:\n" + usage)
+        return
+    await _enqueue_job(message, "create_links_matrix",
+                       {"template": args[0], "urls": list(dict.fromkeys(args[1:]))})
 
 
 @router.message(Command("analytics"), IsAdminFilter())
 async def process_analytics(message: Message, command: Command) -> None:
-    """Собирает и сохраняет статистику переходов по партнерским ссылкам.
+    """Сообщает статистику переходов по партнерским ссылкам.
 
-    Сохраняет суммарное количество переходов для каждой ссылки в колонку F таблицы.
+    По умолчанию сразу отвечает из последнего снимка аналитики, который
+    обновляется в фоне, и показывает его возраст. Если снимка еще нет или
+    передан флаг --fresh, аналитика пересчитывается, а суммарное количество
+    переходов для каждой ссылки записывается в колонку F таблицы.
+    Одновременные пересчеты одной таблицы с одинаковыми флагами
+    объединяются в один.
+    Используется таблица, привязанная к чату.
 
     Args:
         message: Объект сообщения от пользователя.
-        command: Объект команды.
+        command: Объект команды с аргументами.
 
     Returns:
         None: Отправляет сообщения пользователю через message.answer()
+
+    Notes:
+        Пример использования:
+        /analytics
+        /analytics --fresh
+        /analytics --no-cache
     """
+    args = command.args.split() if command.args else []
+    if any(arg not in ("--fresh", "--no-cache") for arg in args):
+        await message.answer(
+            "Ошибка: Неверный ввод команды. Пример:\n"
+            "/analytics [--fresh] [--no-cache]"
+        )
+        return
+    table_id = (await _google_worker_for(message)).table_id
+    snapshot = await _analytics_refresher.latest(table_id)
+    if snapshot is None or args:
+        await message.answer(
+            "---Начинаю считать переходы по ссылкам---"
+        )
+        use_cache = "--no-cache" not in args
+        snapshot = await _single_flight.do(
+            ("analytics", table_id, use_cache),
+            lambda: _analytics_refresher.refresh(table_id, use_cache=use_cache))
+
+    clicks = [count for _, count in snapshot["links"] if count != ""]
+    age = int((time.time() - snapshot["created_at"]) // 60)
     await message.answer(
-        "---Начинаю считать переходы по ссылкам---"
-    )
-    stats = [sum(item["views"] for item in _vk_api_worker.get_link_stats(short_link[0])["stats"])
-             for short_link in _google_worker.get_partner_links()]
-    _google_worker.insert_event_table("F", stats)
-    await message.answer(
-        "Обработал команду аналитики переходов"
+        "Аналитика переходов\n"
+        f"Ссылок: {len(snapshot['links'])}\n"
+        f"Переходов всего: {sum(clicks)}\n"
+        f"Данные обновлены {age} мин. назад"
     )
 
 
+@router.message(Command("vk_stats"), IsAdminFilter())
+async def process_vk_stats(message: Message) -> None:
+    """Отправляет счетчики запросов по каждому сервисному ключу VK.
+
+    Args:
+        message: Объект сообщения от пользователя.
+
+    Note:
+        Токены в ответе маскируются, показываются только последние 4 символа.
+    """
+    lines = [
+        f"{item['token']}: запросов {item['requests']}, ошибок {item['errors']}, "
+        f"ограничений {item['throttled']}, скорость {item['rate']}/с"
+        + (", отстранен" if item["benched"] else "")
+        for item in _vk_api_worker.token_stats()
+    ]
+    await message.answer("\n".join(lines) or "Ключи VK не заданы")
+
+
+@router.message(Command("bind_table"), IsAdminFilter())
+async def process_bind_table(message: Message, command: Command) -> None:
+    """Привязывает чат к Google-таблице.
+
+    После привязки команды /create_table, /create_links и /analytics в этом
+    чате работают с указанной таблицей, а ее аналитика обновляется в фоне.
+    Таблица должна быть открыта для сервисного аккаунта бота.
+
+    Args:
+        message: Объект сообщения от пользователя.
+        command: Объект команды с аргументами.
+
+    Examples:
+        Правильное использование:
+        /bind_table 1AbCdEfGhIjKlMnOpQrStUvWxYz
+
+    Note:
+        Требует предварительной инициализации _db_worker и _sheets_pool
+    """
+    args = command.args.split() if command.args else []
+    if len(args) != 1:
+        await message.answer(
+            "Ошибка: Неверный ввод команды. Пример:\n"
+            "/bind_table <table_id>"
+        )
+        return
+    if await _db_worker.bind_spreadsheet(message.chat.id, args[0]):
+        await message.answer("Чат привязан к таблице")
+    else:
+        await message.answer("Что-то пошло не так")
+
+
+@router.message(Command("unbind_table"), IsAdminFilter())
+async def process_unbind_table(message: Message) -> None:
+    """Удаляет привязку чата к Google-таблице.
+
+    После этого чат снова работает с таблицей по умолчанию из GOOGLE_TABLE_ID.
+
+    Args:
+        message: Объект сообщения от пользователя.
+
+    Note:
+        Требует предварительной инициализации _db_worker
+    """
+    if await _db_worker.unbind_spreadsheet(message.chat.id):
+        await message.answer("Чат отвязан, используется таблица по умолчанию")
+    else:
+        await message.answer("Чат не был привязан к таблице")
+
+
+def _job_line(job: dict) -> str:
+    """Формирует строку с номером, типом, состоянием и прогрессом задачи.
+
+    Args:
+        job: Задача, см. JobStore.get.
+
+    Returns:
+        str: Строка для сообщений /jobs и /job_status.
+    """
+    line = (f"#{job['id']} /{job['kind']}: {STATUS_NAMES.get(job['status'], job['status'])}, "
+            f"{job['done']} из {job['total']}")
+    if job["failed"]:
+        line += f", ошибок: {job['failed']}"
+    return line
+
+
+async def _job_from_args(message: Message, command: Command, usage: str) -> dict | None:
+    """Находит задачу чата по ID из аргументов команды.
+
+    Args:
+        message: Объект сообщения от пользователя.
+        command: Объект команды с аргументами.
+        usage: Пример использования команды для сообщения об ошибке.
+
+    Returns:
+        dict | None: Задача или None, если пользователю отправлено сообщение об ошибке.
+    """
+    args = command.args.split() if command.args else []
+    if len(args) != 1 or not args[0].lstrip("#").isdigit():
+        await message.answer("Ошибка: Неверный ввод команды. Пример:\n" + usage)
+        return None
+    job = await _job_queue.get(int(args[0].lstrip("#")))
+    if job is None or job["chat_id"] != message.chat.id:
+        await message.answer("Задача не найдена")
+        return None
+    return job
+
+
+@router.message(Command("jobs"), IsAdminFilter())
+async def process_jobs(message: Message) -> None:
+    """Отправляет список последних задач генерации ссылок в чате.
+
+    Args:
+        message: Объект сообщения от пользователя.
+
+    Note:
+        Требует предварительной инициализации _job_queue
+    """
+    jobs = await _job_queue.list_jobs(message.chat.id)
+    if not jobs:
+        await message.answer("Задач пока нет")
+        return
+    await message.answer("\n".join(_job_line(job) for job in jobs))
+
+
+@router.message(Command("job_status"), IsAdminFilter())
+async def process_job_status(message: Message, command: Command) -> None:
+    """Сообщает состояние и прогресс задачи.
+
+    Args:
+        message: Объект сообщения от пользователя.
+        command: Объект команды с аргументами.
+
+    Examples:
+        Правильное использование:
+        /job_status 12
+
+    Note:
+        Требует предварительной инициализации _job_queue
+    """
+    job = await _job_from_args(message, command, "/job_status <job_id>")
+    if job is None:
+        return
+    text = _job_line(job)
+    if job["error"]:
+        text += f"\nОшибка: {job['error']}"
+    await message.answer(text)
+
+
+@router.message(Command("job_cancel"), IsAdminFilter())
+async def process_job_cancel(message: Message, command: Command) -> None:
+    """Отменяет задачу из очереди или прерывает выполняющуюся.
+
+    Ссылки, записанные в таблицу до отмены, остаются в ней.
+
+    Args:
+        message: Объект сообщения от пользователя.
+        command: Объект команды с аргументами.
+
+    Examples:
+        Правильное использование:
+        /job_cancel 12
+
+    Note:
+        Требует предварительной инициализации _job_queue
+    """
+    job = await _job_from_args(message, command, "/job_cancel <job_id>")
+    if job is None:
+        return
+    status = await _job_queue.cancel(job["id"])
+    if status in ("queued", "running"):
+        await message.answer(f"Задача #{job['id']} отменена")
+    else:
+        await message.answer(f"Задача #{job['id']} уже не выполняется: "
+                             f"{STATUS_NAMES.get(status, status)}")
+
+
+def _parse_tg_ids(tokens: list[str]) -> tuple[list[int], list[str]]:
+    """Разбирает список Telegram ID из аргументов команды.
+
+    Args:
+        tokens: Аргументы, разделенные пробелами; допускаются и запятые.
+
+    Returns:
+        tuple[list[int], list[str]]: Корректные ID в порядке ввода без
+            повторов и значения, которые не удалось разобрать.
+    """
+    tg_ids, invalid = [], []
+    for token in ",".join(tokens).split(","):
+        token = token.strip()
+        if not token:
+            continue
+        try:
+            tg_ids.append(int(token))
+        except ValueError:
+            invalid.append(token)
+    return list(dict.fromkeys(tg_ids)), invalid
+
+
+def _role_report(results: dict[int, str], invalid: list[str], titles: dict[str, str]) -> str:
+    """Формирует отчет о пакетном изменении ролей.
+
+    Args:
+        results: Результаты DatabaseManager.add_admins или remove_admins.
+        invalid: Значения, которые не удалось разобрать как ID.
+        titles: Заголовки групп отчета по результатам.
+
+    Returns:
+        str: Текст отчета, по строке на каждую непустую группу.
+    """
+    groups = {}
+    for tg_id, status in results.items():
+        groups.setdefault(status, []).append(str(tg_id))
+    lines = [
+        f"{title}: {', '.join(groups[status])}"
+        for status, title in titles.items() if status in groups
+    ]
+    if invalid:
+        lines.append(f"Некорректные id: {', '.join(invalid)}")
+    return "\n".join(lines)
+
+
 @router.message(Command("add_admin"), IsAdminFilter())
 async def process_add_admin(message: Message, command: Command) -> None:
-    """Обрабатывает команду добавления нового администратора.
+    """Обрабатывает команду добавления новых администраторов.
 
-    Проверяет введенный ID пользователя и добавляет его в список администраторов,
-    если пользователь заходил в бота. Команда доступна только текущим администраторам.
+    Принимает один или несколько ID пользователей и назначает их
+    администраторами одной транзакцией. Назначить можно только
+    пользователей, которые заходили в бота. Команда доступна только
+    текущим администраторам.
 
     Args:
         message: Объект сообщения от пользователя.
         command: Объект команды с аргументами.
 
-    Raises:
-        ValueError: Если аргументы команды не соответствуют ожидаемому формату.
-
     Examples:
         Правильное использование:
         /add_admin 123456789
+        /add_admin 123456789 987654321
 
     Note:
         - Требует предварительной инициализации _db_worker
-        - Пользователь с указанным ID должен был зайти в бота хотя бы один раз
+        - Отвечает отчетом по каждому ID
     """
-    if command.args is None:
+    tg_ids, invalid = _parse_tg_ids(command.args.split() if command.args else [])
+    if not tg_ids:
         await message.answer(
             "Ошибка: id нового админа не был введен. Пример:\n"
-            "/add_admin <tg_id>"
-        )
-        return
-    try:
-        if len(command.args.split()) > 1:
-            raise ValueError
-        new_admin_id = command.args.split()[0]
-    except ValueError:
-        await message.answer(
-            "Ошибка: Неверный ввод команды. Пример:\n"
-            "/add_admin <tg_id>"
+            "/add_admin <tg_id> [<tg_id> ...]"
         )
         return
-    if _db_worker.user_exists(new_admin_id):
-        if _db_worker.add_admin(new_admin_id):
-            await message.answer("Администратор успешно добавлен")
-        else:
-            await message.answer("Что-то пошло не так")
-    else:
-        await message.answer(
-            "Ошибка: пользователь с таким id пока не заходил в бота."
-        )
+    results = await _db_worker.add_admins(tg_ids)
+    await message.answer(_role_report(results, invalid, {
+        DatabaseManager.ROLE_UPDATED: "Добавлены администраторы",
+        DatabaseManager.ROLE_UNCHANGED: "Уже администраторы",
+        DatabaseManager.ROLE_NOT_FOUND: "Пока не заходили в бота",
+        DatabaseManager.ROLE_ERROR: "Что-то пошло не так",
+    }))
 
 
 @router.message(Command("remove_admin"), IsAdminFilter())
-async def process_add_admin(message: Message, command: Command) -> None:
-    """Обрабатывает команду удаления пользователя из списка администраторов.
+async def process_remove_admin(message: Message, command: Command) -> None:
+    """Обрабатывает команду удаления пользователей из списка администраторов.
 
-    Проверяет введенный ID пользователя и удаляет его из списка администраторов,
-    если пользователь имеет статус администратора.
-    Команда доступна только текущим администраторам.
+    Принимает один или несколько ID пользователей и снимает с них права
+    администратора одной транзакцией. Команда доступна только текущим
+    администраторам.
 
     Args:
         message: Объект сообщения от пользователя.
         command: Объект команды с аргументами.
 
-    Raises:
-        ValueError: Если аргументы команды не соответствуют ожидаемому формату
-                   (отсутствуют или содержат более одного аргумента).
-
     Examples:
         Правильное использование:
         /remove_admin 123456789
+        /remove_admin 123456789 987654321
 
     Note:
         - Требует предварительной инициализации _db_worker
-        - Пользователь с указанным ID должен существовать и быть администратором
+        - Отвечает отчетом по каждому ID
     """
-    if command.args is None:
+    tg_ids, invalid = _parse_tg_ids(command.args.split() if command.args else [])
+    if not tg_ids:
         await message.answer(
             "Ошибка: id админа не был введен. Пример:\n"
-            "/remove_admin <tg_id>"
+            "/remove_admin <tg_id> [<tg_id> ...]"
         )
         return
-    try:
-        if len(command.args.split()) > 1:
-            raise ValueError
-        admin_id = command.args.split()[0]
-    except ValueError:
+    results = await _db_worker.remove_admins(tg_ids)
+    await message.answer(_role_report(results, invalid, {
+        DatabaseManager.ROLE_UPDATED: "Удалены администраторы",
+        DatabaseManager.ROLE_UNCHANGED: "Не являются администраторами",
+        DatabaseManager.ROLE_NOT_FOUND: "Пока не заходили в бота",
+        DatabaseManager.ROLE_ERROR: "Что-то пошло не так",
+    }))
+
+
+@router.message(Command("import_admins"), IsAdminFilter())
+async def process_import_admins(message: Message) -> None:
+    """Импортирует роли пользователей из CSV-файла.
+
+    Файл отправляется документом с подписью /import_admins. Каждая строка
+    содержит tg_id и необязательную роль admin или user (по умолчанию admin).
+    Строка заголовка, если первая ячейка не число, пропускается. Роли
+    назначаются двумя транзакциями — для администраторов и для пользователей.
+
+    Args:
+        message: Объект сообщения с документом.
+
+    Examples:
+        Содержимое файла::
+
+            tg_id,role
+            123456789,admin
+            987654321,user
+
+    Note:
+        Размер файла ограничен IMPORT_MAX_BYTES. Команда без файла получает
+        подсказку по использованию.
+    """
+    if message.document is None:
         await message.answer(
-            "Ошибка: Неверный ввод команды. Пример:\n"
-            "/remove_admin <tg_id>"
+            "Ошибка: файл не приложен. Отправьте CSV-файл с подписью /import_admins,\n"
+            "каждая строка файла: tg_id[,admin|user]"
         )
         return
-    if _db_worker.is_admin(admin_id):
-        if _db_worker.remove_admin(admin_id):
-            await message.answer("Администратор успешно удален")
-        else:
-            await message.answer("Что-то пошло не так")
-    else:
-        await message.answer(
-            "Ошибка: такого администратора нет."
-        )
-
+    if message.document.file_size and message.document.file_size > IMPORT_MAX_BYTES:
+        await message.answer("Ошибка: файл слишком большой")
+        return
+    data = await message.bot.download(message.document)
+    try:
+        text = data.read().decode("utf-8-sig")
+    except UnicodeDecodeError:
+        await message.answer("Ошибка: файл должен быть в кодировке UTF-8")
+        return
 
-@router.message(Command("add_admin", "remove_admin", "create_table"))
+    by_role = {"admin": [], "user": []}
+    invalid = []
+    for number, row in enumerate(csv.reader(io.StringIO(text))):
+        if not row or not row[0].strip():
+            continue
+        role = row[1].strip().lower() if len(row) > 1 and row[1].strip() else "admin"
+        try:
+            tg_id = int(row[0].strip())
+        except ValueError:
+            if number > 0:
+                invalid.append(row[0].strip())
+            continue
+        if role not in by_role:
+            invalid.append(f"{tg_id} ({role})")
+            continue
+        by_role[role].append(tg_id)
+
+    results = {}
+    if by_role["admin"]:
+        results.update(await _db_worker.add_admins(by_role["admin"]))
+    added = _role_report(results, [], {
+        DatabaseManager.ROLE_UPDATED: "Добавлены администраторы",
+        DatabaseManager.ROLE_UNCHANGED: "Уже администраторы",
+        DatabaseManager.ROLE_NOT_FOUND: "Пока не заходили в бота",
+        DatabaseManager.ROLE_ERROR: "Не удалось назначить",
+    })
+    results = {}
+    if by_role["user"]:
+        results.update(await _db_worker.remove_admins(by_role["user"]))
+    removed = _role_report(results, invalid, {
+        DatabaseManager.ROLE_UPDATED: "Удалены администраторы",
+        DatabaseManager.ROLE_UNCHANGED: "Не являются администраторами",
+        DatabaseManager.ROLE_NOT_FOUND: "Пока не заходили в бота",
+        DatabaseManager.ROLE_ERROR: "Не удалось снять права",
+    })
+    await message.answer("\n".join(filter(None, [added, removed])) or "Файл не содержит id")
+
+
+@router.message(Command("add_admin", "remove_admin", "create_table", "vk_stats",
+                        "bind_table", "unbind_table", "import_admins",
+                        "jobs", "job_status", "job_cancel"))
 async def handle_not_admin(message: Message) -> None:
     """Обрабатывает попытки выполнения административных команд от неавторизованных пользователей.
 
-    Перехватывает команды /add_admin, /remove_admin и /create_table, если они были отправлены
+    Перехватывает команды /add_admin, /remove_admin, /import_admins, /create_table,
+    /vk_stats, /bind_table, /unbind_table, /jobs, /job_status и /job_cancel,
+    если они были отправлены
     пользователями без прав администратора. Отправляет соответствующее уведомление.
 
     Args:
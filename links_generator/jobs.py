@@ -0,0 +1,327 @@
+import asyncio
+import contextlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from aiogram.exceptions import TelegramAPIError
+
+from links_generator.pipeline import LinkPipeline, ProgressMessage, column_letters
+from links_generator.timing import log_if_slow, start_timer
+from links_generator.vk_api.urls import build_url, parse_utm_template, render_utm
+
+logger = logging.getLogger(__name__)
+
+MATRIX_FIRST_COLUMN = "G"
+"""str: Первый столбец листа 'Текущее мероприятие' для /create_links_matrix."""
+
+STATUS_NAMES = {
+    "queued": "в очереди",
+    "running": "выполняется",
+    "done": "завершена",
+    "failed": "ошибка",
+    "cancelled": "отменена",
+}
+"""dict[str, str]: Названия состояний задач для сообщений пользователю."""
+
+
+def job_columns(kind: str, params: dict) -> tuple[dict, dict]:
+    """Строит целевые столбцы LinkPipeline по параметрам задачи.
+
+    Args:
+        kind: Тип задачи: create_links или create_links_matrix.
+        params: Параметры задачи.
+
+    Returns:
+        tuple[dict, dict]: Аргументы columns и headers для LinkPipeline.run.
+
+    Raises:
+        ValueError: Если тип задачи неизвестен или шаблон UTM-меток некорректен.
+    """
+    if kind == "create_links":
+        link = params["link"]
+        return {
+            LinkPipeline.LINK_COLUMN:
+                lambda entry: build_url(link, {"utm_source": entry.abbreviation}),
+        }, {}
+    if kind == "create_links_matrix":
+        template = parse_utm_template(params["template"])
+        letters = column_letters(MATRIX_FIRST_COLUMN, len(params["urls"]))
+
+        def url_builder(url):
+            return lambda entry: build_url(
+                url, render_utm(template, abbr=entry.abbreviation, name=entry.name))
+
+        return ({letter: url_builder(url) for letter, url in zip(letters, params["urls"])},
+                dict(zip(letters, params["urls"])))
+    raise ValueError(f"Неизвестный тип задачи: {kind}")
+
+
+def job_summary(job: dict, result: dict) -> str:
+    """Формирует итоговое сообщение о выполненной задаче.
+
+    Args:
+        job: Задача, см. JobStore.get.
+        result: Итог LinkPipeline.run.
+
+    Returns:
+        str: Текст сообщения.
+    """
+    params = job["params"]
+    if job["kind"] == "create_links":
+        return (f"Задача #{job['id']}: ссылка создана!\n"
+                f"Ваша ссылка: {params['link']}"
+                + (f"\nНе удалось создать ссылок: {result['failed']}"
+                   if result["failed"] else ""))
+    letters = column_letters(MATRIX_FIRST_COLUMN, len(params["urls"]))
+    return (f"Задача #{job['id']}: матрица ссылок создана!\n"
+            + "\n".join(
+                f"{letter}: {url}"
+                + (f" (не удалось создать: {result['failed_by_column'][letter]})"
+                   if result["failed_by_column"][letter] else "")
+                for letter, url in zip(letters, params["urls"])))
+
+
+class JobQueue:
+    """Очередь фоновых задач генерации ссылок с пулом обработчиков.
+
+    Задачи хранятся в JobStore и переживают перезапуск бота: при старте
+    прерванные задачи возвращаются в очередь и продолжаются с последней
+    контрольной точки. Одновременно выполняется не более workers задач
+    и не более per_table задач для одной таблицы.
+
+    Обращения к JobStore выполняются в отдельном потоке и не блокируют
+    цикл событий.
+
+    Задачи дольше slow_threshold секунд записываются в журнал медленных
+    команд с разбивкой времени по этапам, см. timing.log_if_slow.
+
+    Attributes:
+        workers (int): Количество одновременно выполняемых задач.
+        per_table (int): Количество одновременно выполняемых задач одной таблицы.
+        slow_threshold (float | None): Порог медленной задачи в секундах.
+    """
+
+    def __init__(self, store, sheets_pool, vk_api_worker, workers=2, per_table=1,
+                 slow_threshold=None):
+        """Инициализирует JobQueue.
+
+        Args:
+            store: Экземпляр JobStore
+            sheets_pool: Экземпляр SheetsManagerPool с менеджерами таблиц
+            vk_api_worker: Экземпляр AsyncVKLinkManager для работы с VK API
+            workers (int, optional): Количество обработчиков. Defaults to 2.
+            per_table (int, optional): Лимит задач на одну таблицу. Defaults to 1.
+            slow_threshold (float, optional): Порог медленной задачи в секундах.
+                По умолчанию медленные задачи не записываются.
+        """
+        self._store = store
+        self._sheets_pool = sheets_pool
+        self._vk_api_worker = vk_api_worker
+        self.workers = workers
+        self.per_table = per_table
+        self.slow_threshold = slow_threshold
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jobs")
+        self._bot = None
+        self._wakeup = asyncio.Event()
+        self._workers = []
+        self._running = {}
+        self._claim_lock = asyncio.Lock()
+
+    async def _call(self, method: str, *args):
+        """Выполняет метод JobStore в потоке хранилища.
+
+        Args:
+            method: Название метода JobStore.
+            *args: Позиционные аргументы метода.
+
+        Returns:
+            Any: Результат метода.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: getattr(self._store, method)(*args))
+
+    async def start(self, bot) -> None:
+        """Возвращает прерванные задачи в очередь и запускает обработчики.
+
+        Args:
+            bot: Экземпляр aiogram.Bot для сообщений о ходе задач.
+        """
+        self._bot = bot
+        resumed = await self._call("requeue_running")
+        if resumed:
+            logger.info("Возобновлено прерванных задач: %s", resumed)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        """Останавливает обработчики.
+
+        Выполнявшиеся задачи остаются в состоянии running и будут
+        продолжены при следующем запуске.
+        """
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._executor.shutdown(wait=True)
+
+    async def enqueue(self, kind: str, chat_id: int, table_id: str, params: dict) -> tuple[int, bool]:
+        """Ставит задачу в очередь.
+
+        Одинаковая незавершенная задача того же чата не дублируется.
+
+        Args:
+            kind: Тип задачи: create_links или create_links_matrix.
+            chat_id: Telegram ID чата для сообщений о ходе задачи.
+            table_id: ID Google-таблицы.
+            params: Параметры задачи.
+
+        Returns:
+            tuple[int, bool]: ID задачи и флаг, что задача создана, а не найдена.
+
+        Raises:
+            ValueError: Если параметры задачи некорректны.
+        """
+        job_columns(kind, params)
+        job_id, created = await self._call("enqueue", kind, chat_id, table_id, params)
+        if created:
+            self._wakeup.set()
+        return job_id, created
+
+    async def set_message(self, job_id: int, message_id: int) -> None:
+        """Запоминает сообщение, в котором отображается ход задачи."""
+        await self._call("set_message", job_id, message_id)
+
+    async def get(self, job_id: int) -> dict | None:
+        """Возвращает задачу по ID, см. JobStore.get."""
+        return await self._call("get", job_id)
+
+    async def list_jobs(self, chat_id: int, limit: int = 10) -> list[dict]:
+        """Возвращает последние задачи чата, см. JobStore.list_jobs."""
+        return await self._call("list_jobs", chat_id, limit)
+
+    async def cancel(self, job_id: int) -> str | None:
+        """Отменяет задачу и прерывает ее выполнение.
+
+        Args:
+            job_id: ID задачи.
+
+        Returns:
+            str | None: Состояние задачи до отмены или None, если задача не найдена.
+        """
+        status = await self._call("cancel", job_id)
+        task = self._running.get(job_id, (None, None))[0]
+        if task is not None:
+            task.cancel()
+        return status
+
+    def _busy_tables(self) -> list[str]:
+        """Возвращает таблицы, для которых достигнут лимит одновременных задач."""
+        counts = {}
+        for _, table_id in self._running.values():
+            counts[table_id] = counts.get(table_id, 0) + 1
+        return [table_id for table_id, count in counts.items() if count >= self.per_table]
+
+    async def _worker(self) -> None:
+        """Берет задачи из очереди и выполняет их, пока очередь не опустеет."""
+        while True:
+            await self._wakeup.wait()
+            async with self._claim_lock:
+                job = await self._call("claim_next", self._busy_tables())
+                if job is None:
+                    self._wakeup.clear()
+                    continue
+                task = asyncio.create_task(self._execute_timed(job))
+                self._running[job["id"]] = (task, job["table_id"])
+            try:
+                await asyncio.shield(task)
+            except asyncio.CancelledError:
+                # Отменена только сама задача — обработчик продолжает работу
+                if asyncio.current_task().cancelling():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    raise
+            except Exception as e:
+                # Ошибка вне обработки задачи, например в SQLite: обработчик
+                # не должен останавливаться, а задача — оставаться в running
+                logger.exception("Ошибка обработчика задачи #%s", job["id"])
+                with contextlib.suppress(Exception):
+                    if (await self._call("get", job["id"]))["status"] == "running":
+                        await self._call("finish", job["id"], "failed", str(e))
+            finally:
+                self._running.pop(job["id"], None)
+                # Освободилось место, в том числе для задач этой же таблицы
+                self._wakeup.set()
+
+    async def _notify(self, job: dict, text: str) -> None:
+        """Отправляет сообщение в чат задачи, не прерывая задачу при ошибке."""
+        try:
+            await self._bot.send_message(job["chat_id"], text)
+        except TelegramAPIError as e:
+            logger.warning("Ошибка при отправке сообщения о задаче #%s: %s", job["id"], e)
+
+    async def _execute_timed(self, job: dict) -> None:
+        """Выполняет задачу с PhaseTimer и записывает ее, если она медленная.
+
+        Args:
+            job: Задача, см. JobStore.get.
+        """
+        with start_timer() as timer:
+            try:
+                await self._execute(job)
+            finally:
+                if self.slow_threshold is not None:
+                    log_if_slow("slow_job", timer, self.slow_threshold,
+                                job_id=job["id"], command=job["kind"],
+                                args=job["params"], chat_id=job["chat_id"],
+                                table_id=job["table_id"])
+
+    async def _execute(self, job: dict) -> None:
+        """Выполняет задачу генерации ссылок с сохранением контрольных точек.
+
+        Args:
+            job: Задача, см. JobStore.get.
+        """
+        job_id = job["id"]
+        try:
+            columns, headers = job_columns(job["kind"], job["params"])
+            completed = await self._call("get_checkpoints", job_id)
+            progress = None
+            if job["message_id"] is not None:
+                async def edit(text):
+                    await self._bot.edit_message_text(
+                        text, chat_id=job["chat_id"], message_id=job["message_id"])
+                progress = ProgressMessage(edit, f"Задача #{job_id}")
+
+            async def on_progress(done, total, failed, elapsed):
+                await self._call("set_progress", job_id, total, done, failed)
+                if progress is not None:
+                    await progress.update(done, total, failed, elapsed)
+
+            async def on_flush(items):
+                await self._call("save_checkpoints", job_id, [
+                    item for item in items if item[3] is not None])
+
+            google_worker = self._sheets_pool.get(job["table_id"])
+            result = await LinkPipeline(google_worker, self._vk_api_worker).run(
+                columns, on_progress, headers=headers, completed=completed,
+                on_flush=on_flush)
+        except asyncio.CancelledError:
+            if (await self._call("get", job_id))["status"] == "cancelled":
+                await self._notify(job, f"Задача #{job_id} отменена")
+                return
+            raise
+        except Exception as e:
+            logger.exception("Ошибка выполнения задачи #%s", job_id)
+            await self._call("finish", job_id, "failed", str(e))
+            await self._notify(job, f"Задача #{job_id} завершилась с ошибкой: {e}")
+            return
+
+        await self._call("set_progress", job_id, result["total"], result["total"],
+                         result["failed"])
+        await self._call("finish", job_id, "done")
+        if progress is not None:
+            await progress.update(result["total"], result["total"], result["failed"],
+                                  result["elapsed"], final=True)
+        await self._notify(job, job_summary(job, result))
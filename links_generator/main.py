@@ -1,37 +1,114 @@
 import asyncio
 import logging
 from aiogram import Bot, Dispatcher
-from pathlib import Path
 import os
 from dotenv import load_dotenv
 import links_generator.handler_commands as handler_commands
-from links_generator.googletables.worktables import GoogleSheetsManager
-from links_generator.vk_api.vk_api import VKLinkManager
-from links_generator.databases.databases import DatabaseManager
+from links_generator.googletables.pool import SheetsManagerPool
+from links_generator.googletables.scheduler import SheetsRequestScheduler
+from links_generator.vk_api.async_vk_api import AsyncVKLinkManager
+from links_generator.vk_api.token_pool import TokenPool
+from links_generator.databases.async_databases import AsyncDatabaseManager
+from links_generator.analytics import AnalyticsRefresher
+from links_generator.databases.jobs import JobStore
+from links_generator.jobs import JobQueue
+import links_generator.metrics as metrics
+from links_generator.timing import TelegramTiming
 
 load_dotenv(override=True)
 
 # Инициализация логгера в глобальной области
 logger = logging.getLogger(__name__)
 
-if os.environ.get('GENERATING_DOCS'):
-    google_worker = None
-else:
-    google_worker = GoogleSheetsManager(os.getenv("GOOGLE_TABLE_ID"))
 
-vk_api_worker = VKLinkManager(os.getenv("VK_TOKEN"))
-db_worker = DatabaseManager("data/users.db")
-admin_id = os.getenv("TG_ADMIN_ID")
+def create_workers() -> dict:
+    """Создает менеджеры внешних сервисов и базы данных.
+
+    Вызывается из async_main после настройки логирования, а не при импорте
+    модуля. Тяжелая инициализация Google Sheets (импорт библиотек, сборка
+    сервиса, получение токена) откладывается до warm_up или первого запроса.
+
+    Returns:
+        dict: Словарь с ключами sheets_pool, vk_api_worker, db_worker,
+            admin_id, analytics_refresher, job_queue и slow_threshold.
+    """
+    sheets_pool = SheetsManagerPool(
+        os.getenv("GOOGLE_TABLE_ID"),
+        max_size=int(os.getenv("SHEETS_POOL_SIZE", "16")),
+        max_workers=int(os.getenv("SHEETS_WORKERS", "4")),
+        scheduler=SheetsRequestScheduler(
+            read_limit=int(os.getenv("SHEETS_READ_QUOTA", "60")),
+            write_limit=int(os.getenv("SHEETS_WRITE_QUOTA", "60")),
+        ),
+    )
+    db_worker = AsyncDatabaseManager(
+        "data/users.db", readers=int(os.getenv("DB_READERS", "4")))
+    vk_api_worker = AsyncVKLinkManager(
+        os.getenv("VK_TOKEN"),
+        total_timeout=float(os.getenv("VK_TIMEOUT", "30")),
+        connect_timeout=float(os.getenv("VK_CONNECT_TIMEOUT", "5")),
+        token_pool=TokenPool.from_env(
+            os.getenv("VK_TOKEN"),
+            rate=float(os.getenv("VK_RATE", "3")),
+            max_rate=float(os.getenv("VK_MAX_RATE", "20")),
+        ),
+        link_cache=db_worker,
+    )
+    analytics_refresher = AnalyticsRefresher(
+        sheets_pool, vk_api_worker, db_worker,
+        interval=float(os.getenv("ANALYTICS_REFRESH_INTERVAL", "900")),
+    )
+    job_queue = JobQueue(
+        JobStore("data/jobs.db"), sheets_pool, vk_api_worker,
+        workers=int(os.getenv("JOB_WORKERS", "2")),
+        per_table=int(os.getenv("JOB_PER_TABLE", "1")),
+        slow_threshold=float(os.getenv("SLOW_COMMAND_SECONDS", "5")),
+    )
+    return {
+        "sheets_pool": sheets_pool,
+        "vk_api_worker": vk_api_worker,
+        "db_worker": db_worker,
+        "admin_id": os.getenv("TG_ADMIN_ID"),
+        "analytics_refresher": analytics_refresher,
+        "job_queue": job_queue,
+        "slow_threshold": job_queue.slow_threshold,
+    }
+
+
+async def warm_up(sheets_pool) -> None:
+    """Фоново прогревает клиент Google Sheets после старта поллинга.
+
+    Ошибки прогрева только логируются: при неудаче клиент будет
+    инициализирован при первом запросе.
+
+    Args:
+        sheets_pool: Экземпляр SheetsManagerPool
+    """
+    try:
+        await sheets_pool.warm_up()
+        logger.info("Клиент Google Sheets прогрет")
+    except Exception:
+        logger.exception("Не удалось прогреть клиент Google Sheets")
 
 
 async def async_main():
     """Асинхронная основная функция для запуска бота.
 
-    Читает токен бота из переменных окружения, инициализирует бота и диспетчер,
-    настраивает обработчики команд и запускает поллинг.
+    Читает токен бота из переменных окружения, создает менеджеры, инициализирует
+    бота и диспетчер, настраивает обработчики команд, запускает фоновое обновление
+    аналитики, очередь задач генерации ссылок, прогрев Google Sheets, сервер
+    метрик и прием обновлений.
+
+    Метрики в формате Prometheus отдаются по адресу
+    http://METRICS_HOST:METRICS_PORT/metrics; METRICS_PORT=0 отключает сервер.
+
+    Обновления принимаются поллингом или, при BOT_MODE=webhook, через webhook
+    по адресу WEBHOOK_URL + WEBHOOK_PATH, см. webhook.run_webhook.
 
     Raises:
-        ValueError: Если BOT_TOKEN не найден в переменных окружения или .env файле.
+        ValueError: Если BOT_TOKEN не найден в переменных окружения или .env файле,
+            BOT_MODE неизвестен или для режима webhook не заданы WEBHOOK_URL
+            и WEBHOOK_SECRET.
     """
     BOT_TOKEN = os.getenv("BOT_TOKEN")
     if not BOT_TOKEN:
@@ -40,15 +117,62 @@ async def async_main():
     if not config.get("BOT_TOKEN"):
         logger.error("BOT_TOKEN не найден в .env файле!")
         raise ValueError("BOT_TOKEN не найден в .env файле!")
+    mode = os.getenv("BOT_MODE", "polling")
+    if mode not in ("polling", "webhook"):
+        raise ValueError(f"Неизвестный BOT_MODE: {mode}, ожидается polling или webhook")
+    if mode == "webhook" and not (os.getenv("WEBHOOK_URL") and os.getenv("WEBHOOK_SECRET")):
+        raise ValueError("Для BOT_MODE=webhook нужно задать WEBHOOK_URL и WEBHOOK_SECRET!")
 
-    logger.info("Запуск бота")
+    logger.info("Запуск бота в режиме %s", mode)
+    workers = create_workers()
     bot = Bot(token=config["BOT_TOKEN"])
+    bot.session.middleware(TelegramTiming())
     dp = Dispatcher()
     handler_commands.setup(
-        dp, google_worker, vk_api_worker, db_worker, admin_id)
+        dp, workers["sheets_pool"], workers["vk_api_worker"],
+        workers["db_worker"], workers["admin_id"], workers["analytics_refresher"],
+        workers["job_queue"], workers["slow_threshold"])
+
+    background = set()
+
+    async def on_startup():
+        task = asyncio.create_task(warm_up(workers["sheets_pool"]))
+        background.add(task)
+        task.add_done_callback(background.discard)
+
+    dp.startup.register(on_startup)
 
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    metrics_port = int(os.getenv("METRICS_PORT", "9100"))
+    metrics_runner = None
+    try:
+        if metrics_port:
+            metrics_runner = await metrics.start_server(
+                os.getenv("METRICS_HOST", "127.0.0.1"), metrics_port)
+        workers["analytics_refresher"].start()
+        await workers["job_queue"].start(bot)
+        if mode == "webhook":
+            # aiohttp.web нужен только в режиме webhook и не замедляет запуск поллинга
+            from links_generator.webhook import run_webhook
+            await run_webhook(
+                dp, bot,
+                url=os.getenv("WEBHOOK_URL"),
+                path=os.getenv("WEBHOOK_PATH", "/webhook"),
+                secret=os.getenv("WEBHOOK_SECRET"),
+                host=os.getenv("WEBHOOK_HOST", "0.0.0.0"),
+                port=int(os.getenv("WEBHOOK_PORT", "8080")),
+                max_updates=int(os.getenv("WEBHOOK_MAX_UPDATES", "16")),
+            )
+        else:
+            await bot.delete_webhook(drop_pending_updates=True)
+            await dp.start_polling(bot)
+    finally:
+        await workers["job_queue"].stop()
+        await workers["analytics_refresher"].stop()
+        await workers["vk_api_worker"].close()
+        workers["sheets_pool"].close()
+        workers["db_worker"].close()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
 
 
 def main():
@@ -0,0 +1,291 @@
+import contextlib
+import threading
+import time
+
+from aiogram import BaseMiddleware
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                   30.0, 60.0, 120.0, 300.0)
+"""tuple[float]: Верхние границы корзин гистограмм задержек в секундах."""
+
+
+def _escape(value) -> str:
+    """Экранирует значение метки для текстового формата Prometheus."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    """Формирует блок меток {name="value",...} для строки метрики.
+
+    Args:
+        names: Названия меток.
+        values: Значения меток в том же порядке.
+        extra: Дополнительная уже отформатированная метка, например le="0.5".
+
+    Returns:
+        str: Блок меток или пустая строка, если меток нет.
+    """
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Монотонно растущий счетчик с метками.
+
+    Attributes:
+        name (str): Название метрики.
+        help (str): Описание метрики.
+        labelnames (tuple[str]): Названия меток.
+    """
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        """Инициализирует Counter.
+
+        Args:
+            name: Название метрики.
+            help: Описание метрики.
+            labelnames (tuple[str], optional): Названия меток. Defaults to ().
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        """Увеличивает счетчик.
+
+        Args:
+            *labels: Значения меток в порядке labelnames.
+            amount (float, optional): Величина увеличения. Defaults to 1.
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        """Возвращает текущее значение счетчика для меток."""
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        """Возвращает строки метрики в текстовом формате Prometheus."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """Гистограмма значений, например задержек, с метками.
+
+    Attributes:
+        name (str): Название метрики.
+        help (str): Описание метрики.
+        labelnames (tuple[str]): Названия меток.
+        buckets (tuple[float]): Верхние границы корзин.
+    """
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Инициализирует Histogram.
+
+        Args:
+            name: Название метрики.
+            help: Описание метрики.
+            labelnames (tuple[str], optional): Названия меток. Defaults to ().
+            buckets (tuple[float], optional): Верхние границы корзин.
+                Defaults to DEFAULT_BUCKETS.
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        """Добавляет наблюдение.
+
+        Args:
+            value: Наблюдаемое значение.
+            *labels: Значения меток в порядке labelnames.
+        """
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Счетчики корзин, сумма и количество наблюдений
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        """Возвращает строки метрики в текстовом формате Prometheus.
+
+        Значения корзин выводятся накопительно, как требует формат.
+        """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total, count))
+                           for labels, (counts, total, count) in self._series.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Registry:
+    """Набор метрик, отдаваемых одним запросом /metrics."""
+
+    def __init__(self):
+        """Инициализирует пустой Registry."""
+        self._metrics = []
+
+    def register(self, metric):
+        """Добавляет метрику в набор.
+
+        Args:
+            metric: Экземпляр Counter или Histogram.
+
+        Returns:
+            Counter | Histogram: Та же метрика, для присваивания при объявлении.
+        """
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Возвращает все метрики в текстовом формате Prometheus."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+"""Registry: Метрики бота."""
+
+BACKEND_CALLS = REGISTRY.register(Counter(
+    "links_generator_backend_calls_total",
+    "Количество обращений к внешним сервисам и базе данных.",
+    ("backend", "method")))
+BACKEND_ERRORS = REGISTRY.register(Counter(
+    "links_generator_backend_errors_total",
+    "Количество обращений к внешним сервисам и базе данных, завершившихся ошибкой.",
+    ("backend", "method")))
+BACKEND_LATENCY = REGISTRY.register(Histogram(
+    "links_generator_backend_latency_seconds",
+    "Длительность обращений к внешним сервисам и базе данных.",
+    ("backend", "method")))
+HANDLER_CALLS = REGISTRY.register(Counter(
+    "links_generator_handler_calls_total",
+    "Количество обработанных команд.",
+    ("command",)))
+HANDLER_ERRORS = REGISTRY.register(Counter(
+    "links_generator_handler_errors_total",
+    "Количество команд, обработчик которых завершился исключением.",
+    ("command",)))
+HANDLER_LATENCY = REGISTRY.register(Histogram(
+    "links_generator_handler_latency_seconds",
+    "Длительность обработки команд.",
+    ("command",)))
+
+
+@contextlib.contextmanager
+def track(backend: str, method: str):
+    """Учитывает обращение к сервису: количество, ошибки и длительность.
+
+    Подходит и для кода в пуле потоков, и для асинхронного кода — блок
+    with может содержать await. Ошибкой считается исключение внутри блока;
+    ответ сервиса с ошибкой можно учесть явно через BACKEND_ERRORS.
+
+    Args:
+        backend: Сервис: vk, sheets или db.
+        method: Метод сервиса.
+
+    Examples:
+        >>> with track("db", "is_admin"):
+        ...     pass
+        >>> BACKEND_CALLS.value("db", "is_admin") >= 1
+        True
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        BACKEND_ERRORS.inc(backend, method)
+        raise
+    finally:
+        BACKEND_CALLS.inc(backend, method)
+        BACKEND_LATENCY.observe(time.perf_counter() - started, backend, method)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Учитывает количество, ошибки и длительность обработки команд.
+
+    Регистрируется как внутренний middleware роутера, поэтому вызывается
+    только для сообщений, прошедших фильтры какого-либо обработчика.
+    """
+
+    async def __call__(self, handler, event, data):
+        """Выполняет обработчик и записывает метрики по названию команды.
+
+        Args:
+            handler: Следующий обработчик в цепочке.
+            event: Сообщение Telegram.
+            data: Данные, передаваемые обработчикам.
+
+        Returns:
+            Any: Результат обработчика.
+        """
+        command = data.get("command")
+        if command is not None:
+            name = command.command
+        else:
+            name = data["handler"].callback.__name__
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.inc(name)
+            raise
+        finally:
+            HANDLER_CALLS.inc(name)
+            HANDLER_LATENCY.observe(time.perf_counter() - started, name)
+
+
+async def start_server(host: str = "127.0.0.1", port: int = 9100, registry=REGISTRY):
+    """Запускает HTTP-сервер, отдающий метрики по GET /metrics.
+
+    Args:
+        host (str, optional): Адрес сервера. Defaults to "127.0.0.1".
+        port (int, optional): Порт сервера. Defaults to 9100.
+        registry (Registry, optional): Отдаваемые метрики. Defaults to REGISTRY.
+
+    Returns:
+        aiohttp.web.AppRunner: Запущенный сервер; остановка — runner.cleanup().
+    """
+    from aiohttp import web
+
+    async def metrics(request):
+        return web.Response(text=registry.render(), headers={
+            "Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
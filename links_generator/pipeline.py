@@ -0,0 +1,337 @@
+import asyncio
+import logging
+import time
+
+from aiogram.exceptions import TelegramAPIError
+
+from links_generator.googletables.partner_index import row_ranges
+from links_generator.googletables.worktables import GoogleSheetsManager
+from links_generator.timing import add_rows
+
+logger = logging.getLogger(__name__)
+
+EVENT_SHEET = "Текущее мероприятие"
+
+
+def format_progress(title: str, done: int, total: int, failed: int, elapsed: float) -> str:
+    """Формирует текст сообщения о ходе генерации ссылок.
+
+    Args:
+        title: Заголовок сообщения.
+        done: Количество обработанных ссылок.
+        total: Общее количество ссылок.
+        failed: Количество ссылок, которые не удалось создать.
+        elapsed: Время с начала генерации в секундах.
+
+    Returns:
+        str: Текст со счетчиком, скоростью и оставшимся временем.
+
+    Examples:
+        >>> print(format_progress("Генерация", 50, 200, 0, 10.0))
+        Генерация
+        Готово: 50 из 200
+        Скорость: 5.0 ссылок/с
+        Осталось примерно: 30 с
+    """
+    rate = done / elapsed if elapsed > 0 else 0.0
+    lines = [title, f"Готово: {done} из {total}", f"Скорость: {rate:.1f} ссылок/с"]
+    if done < total and rate > 0:
+        lines.append(f"Осталось примерно: {int((total - done) / rate)} с")
+    if failed:
+        lines.append(f"Не удалось создать ссылок: {failed}")
+    return "\n".join(lines)
+
+
+class ProgressMessage:
+    """Сообщение Telegram, которое редактируется по мере генерации ссылок.
+
+    Telegram ограничивает частоту редактирования сообщений, поэтому
+    промежуточные обновления отправляются не чаще min_interval секунд,
+    а ошибки редактирования не прерывают генерацию.
+
+    Attributes:
+        title (str): Заголовок сообщения.
+        min_interval (float): Минимальный интервал между обновлениями в секундах.
+    """
+
+    def __init__(self, edit, title, min_interval=2.0):
+        """Инициализирует ProgressMessage.
+
+        Args:
+            edit: Асинхронная функция, заменяющая текст сообщения, например
+                Message.edit_text отправленного ботом сообщения.
+            title (str): Заголовок сообщения.
+            min_interval (float, optional): Минимальный интервал между обновлениями
+                в секундах. Defaults to 2.0.
+        """
+        self._edit = edit
+        self.title = title
+        self.min_interval = min_interval
+        self._last_update = 0.0
+        self._text = None
+
+    async def update(self, done: int, total: int, failed: int, elapsed: float,
+                     final=False) -> None:
+        """Обновляет текст сообщения.
+
+        Args:
+            done: Количество обработанных ссылок.
+            total: Общее количество ссылок.
+            failed: Количество ссылок, которые не удалось создать.
+            elapsed: Время с начала генерации в секундах.
+            final (bool, optional): Обновить без учета min_interval. Defaults to False.
+        """
+        now = time.monotonic()
+        if not final and now - self._last_update < self.min_interval:
+            return
+        text = format_progress(self.title, done, total, failed, elapsed)
+        if text == self._text:
+            return
+        self._last_update = now
+        try:
+            await self._edit(text)
+            self._text = text
+        except TelegramAPIError as e:
+            logger.warning("Ошибка при обновлении сообщения о ходе генерации: %s", e)
+
+
+def column_letters(start: str, count: int) -> list[str]:
+    """Возвращает буквы count столбцов подряд, начиная со start.
+
+    Args:
+        start: Буква первого столбца.
+        count: Количество столбцов.
+
+    Returns:
+        list[str]: Буквы столбцов в A1-нотации.
+
+    Examples:
+        >>> column_letters("Y", 4)
+        ['Y', 'Z', 'AA', 'AB']
+    """
+    first = 0
+    for char in start.upper():
+        first = first * 26 + ord(char) - ord("A") + 1
+    letters = []
+    for number in range(first, first + count):
+        letter = ""
+        while number:
+            number, rest = divmod(number - 1, 26)
+            letter = chr(ord("A") + rest) + letter
+        letters.append(letter)
+    return letters
+
+
+class LinkPipeline:
+    """Потоковая генерация коротких ссылок для партнеров с записью по частям.
+
+    Генерация идет в три этапа, связанных очередями:
+
+    - партнеры читаются из листа 'Активные партнеры', названия и
+      аббревиатуры сразу записываются в столбцы A и B листа
+      'Текущее мероприятие';
+    - несколько обработчиков параллельно сокращают ссылки порциями по
+      chunk_size ссылок — для всех целевых столбцов вперемешку;
+    - готовые ссылки записываются в таблицу по строкам партнеров, как
+      только накопится flush_rows ссылок или пройдет flush_interval секунд.
+
+    Поэтому первые ссылки появляются в таблице через несколько секунд,
+    а при сбое посередине уже записанные ссылки сохраняются. Ссылки
+    столбца LINK_COLUMN также запоминаются в PartnerIndex таблицы —
+    по ним считается аналитика переходов.
+
+    Attributes:
+        chunk_size (int): Количество ссылок в одном запросе на сокращение.
+        concurrency (int): Количество одновременных запросов на сокращение.
+        flush_rows (int): Количество ссылок, после которого они записываются в таблицу.
+        flush_interval (float): Максимальная задержка записи готовых ссылок в секундах.
+    """
+
+    LINK_COLUMN = "C"
+    """str: Столбец основных ссылок партнеров."""
+
+    def __init__(self, google_worker, vk_api_worker, chunk_size=50, concurrency=4,
+                 flush_rows=100, flush_interval=2.0):
+        """Инициализирует LinkPipeline.
+
+        Args:
+            google_worker: Экземпляр AsyncGoogleSheetsManager таблицы мероприятия
+            vk_api_worker: Экземпляр AsyncVKLinkManager для работы с VK API
+            chunk_size (int, optional): Ссылок в одном запросе. Defaults to 50.
+            concurrency (int, optional): Одновременных запросов. Defaults to 4.
+            flush_rows (int, optional): Порог записи по количеству ссылок. Defaults to 100.
+            flush_interval (float, optional): Порог записи по времени в секундах.
+                Defaults to 2.0.
+        """
+        self._google_worker = google_worker
+        self._vk_api_worker = vk_api_worker
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+
+    async def _prepare(self, columns: list[str], headers: dict[str, str]) -> list:
+        """Читает партнеров и записывает столбцы A и B листа мероприятия.
+
+        В целевых столбцах сразу очищаются строки партнеров без аббревиатуры
+        и записываются заголовки.
+
+        Args:
+            columns: Буквы целевых столбцов.
+            headers: Заголовки целевых столбцов {буква: текст}.
+
+        Returns:
+            list[PartnerEntry]: Партнеры, для которых нужно создать ссылки.
+        """
+        partner_index = self._google_worker.partner_index
+        partner_index.sync_partners(await self._google_worker.get_partners())
+        entries = partner_index.with_abbreviation()
+        rows = {entry.row for entry in entries}
+        if self.LINK_COLUMN in columns:
+            for entry in partner_index.entries():
+                if entry.row not in rows:
+                    partner_index.set_short_link(entry.row, "")
+
+        data = {f"{EVENT_SHEET}!{column}1": [[header]] for column, header in headers.items()}
+        names = partner_index.field_column("name")
+        if names:
+            data.update(GoogleSheetsManager.event_columns_data({
+                "A": names,
+                "B": partner_index.field_column("abbreviation"),
+            }))
+            cleared = {
+                partner_index.start_row + offset: ""
+                for offset in range(len(names))
+                if partner_index.start_row + offset not in rows
+            }
+            for column in columns:
+                data.update(row_ranges(EVENT_SHEET, column, cleared))
+        if data:
+            await self._google_worker.batch_update_values(data)
+        return entries
+
+    async def _flush(self, pending: list[tuple], on_flush) -> None:
+        """Записывает готовые ссылки одним запросом.
+
+        Args:
+            pending: Кортежи (столбец, строка, длинный URL, короткая ссылка или None).
+            on_flush: Асинхронная функция, получающая pending после записи, или None.
+        """
+        by_column = {}
+        for column, row, _, short_link in pending:
+            by_column.setdefault(column, {})[row] = short_link or ""
+        data = {}
+        for column, values_by_row in by_column.items():
+            data.update(row_ranges(EVENT_SHEET, column, values_by_row))
+        await self._google_worker.batch_update_values(data)
+        if on_flush is not None:
+            await on_flush(pending)
+
+    async def run(self, columns: dict, on_progress=None, headers=None,
+                  completed=None, on_flush=None) -> dict:
+        """Создает короткие ссылки для всех партнеров с аббревиатурой.
+
+        Args:
+            columns: Словарь {буква столбца: функция, принимающая PartnerEntry
+                и возвращающая длинный URL}.
+            on_progress: Асинхронная функция (done, total, failed, elapsed),
+                вызываемая после каждой обработанной порции. Defaults to None.
+            headers (dict[str, str], optional): Заголовки целевых столбцов,
+                записываемые в первую строку. Defaults to None.
+            completed (dict, optional): Ссылки, созданные и записанные прошлым
+                запуском, {(столбец, строка): (длинный URL, короткая ссылка)}.
+                Они не создаются повторно, если длинный URL строки не изменился.
+                Defaults to None.
+            on_flush (optional): Асинхронная функция, вызываемая после каждой
+                записи в таблицу со списком кортежей (столбец, строка,
+                длинный URL, короткая ссылка или None). Defaults to None.
+
+        Returns:
+            dict: Итог с ключами total, created, failed и elapsed, а также
+                failed_by_column — количество ошибок по столбцам.
+
+        Raises:
+            Exception: Ошибка сокращения ссылок; ссылки, готовые к моменту
+                ошибки, перед этим записываются в таблицу.
+        """
+        started = time.monotonic()
+        partner_index = self._google_worker.partner_index
+        entries = await self._prepare(list(columns), headers or {})
+        completed = completed or {}
+        items = []
+        done = 0
+        for column in columns:
+            for entry in entries:
+                url = columns[column](entry)
+                previous = completed.get((column, entry.row))
+                if previous is not None and previous[0] == url:
+                    if column == self.LINK_COLUMN:
+                        partner_index.set_short_link(entry.row, previous[1])
+                    done += 1
+                else:
+                    items.append((column, entry, url))
+        total = done + len(items)
+
+        chunks = asyncio.Queue()
+        for i in range(0, len(items), self.chunk_size):
+            chunks.put_nowait(items[i:i + self.chunk_size])
+        results = asyncio.Queue()
+        errors = []
+
+        async def shorten() -> None:
+            try:
+                while not chunks.empty() and not errors:
+                    chunk = chunks.get_nowait()
+                    short_links = await self._vk_api_worker.get_short_links(
+                        [url for _, _, url in chunk])
+                    await results.put(list(zip(chunk, short_links)))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                await results.put(None)
+
+        workers = [asyncio.create_task(shorten()) for _ in range(self.concurrency)]
+        finished = 0
+        failed_by_column = dict.fromkeys(columns, 0)
+        pending = []
+        last_flush = time.monotonic()
+        try:
+            while finished < len(workers):
+                try:
+                    batch = await asyncio.wait_for(results.get(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    batch = []
+                if batch is None:
+                    finished += 1
+                    batch = []
+                add_rows(len(batch))
+                for (column, entry, url), short_link in batch:
+                    if column == self.LINK_COLUMN:
+                        partner_index.set_short_link(entry.row, short_link or "")
+                    pending.append((column, entry.row, url, short_link))
+                    done += 1
+                    failed_by_column[column] += short_link is None
+
+                if pending and (len(pending) >= self.flush_rows
+                                or finished == len(workers)
+                                or time.monotonic() - last_flush >= self.flush_interval):
+                    await self._flush(pending, on_flush)
+                    pending = []
+                    last_flush = time.monotonic()
+                if batch and on_progress is not None:
+                    await on_progress(done, total, sum(failed_by_column.values()),
+                                      time.monotonic() - started)
+        finally:
+            # При отмене генерации обработчики не должны продолжать сокращение
+            for worker in workers:
+                worker.cancel()
+        if errors:
+            raise errors[0]
+        failed = sum(failed_by_column.values())
+        return {
+            "total": total,
+            "created": done - failed,
+            "failed": failed,
+            "failed_by_column": failed_by_column,
+            "elapsed": time.monotonic() - started,
+        }
@@ -0,0 +1,82 @@
+import asyncio
+import contextlib
+
+
+class SingleFlight:
+    """Объединение одновременных одинаковых вычислений.
+
+    Пока вычисление с некоторым ключом выполняется, повторные вызовы с тем
+    же ключом не запускают его заново, а дожидаются текущего и получают
+    тот же результат или то же исключение. После завершения ключ
+    освобождается, и следующий вызов запускает вычисление снова.
+
+    Отмена одного из ожидающих не отменяет общее вычисление.
+    """
+
+    def __init__(self):
+        """Инициализирует SingleFlight без выполняющихся вычислений."""
+        self._calls = {}
+
+    async def do(self, key, call):
+        """Выполняет вычисление или присоединяется к уже выполняющемуся.
+
+        Args:
+            key: Хешируемый ключ вычисления, например (команда, аргументы).
+            call: Функция без аргументов, возвращающая корутину вычисления.
+
+        Returns:
+            Any: Результат вычисления.
+
+        Raises:
+            Exception: Исключение, с которым завершилось вычисление.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task) -> None:
+        """Освобождает ключ завершившегося вычисления.
+
+        Args:
+            key: Ключ вычисления.
+            task: Завершившаяся задача вычисления.
+        """
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Исключение считается полученным, даже если все ожидающие были отменены
+        if not task.cancelled():
+            task.exception()
+
+
+class KeyedLocks:
+    """Набор asyncio.Lock по ключам, например по ID таблицы.
+
+    Блокировка существует, пока ее кто-то удерживает или ожидает, поэтому
+    набор не растет с количеством когда-либо использованных ключей.
+    """
+
+    def __init__(self):
+        """Инициализирует пустой набор блокировок."""
+        self._locks = {}
+        self._waiters = {}
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key):
+        """Захватывает блокировку ключа на время блока async with.
+
+        Args:
+            key: Хешируемый ключ.
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                del self._locks[key]
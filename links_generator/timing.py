@@ -0,0 +1,195 @@
+import contextlib
+import contextvars
+import json
+import logging
+import time
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+
+slow_logger = logging.getLogger("links_generator.slow")
+"""logging.Logger: Журнал медленных команд и задач, одна JSON-запись на строку."""
+
+PHASES = ("sheet_read", "vk", "sheet_write", "telegram_reply")
+"""tuple[str]: Этапы, на которые раскладывается время обработки."""
+
+ARGS_MAX_LENGTH = 200
+"""int: Максимальная длина аргументов команды в журнале медленных команд."""
+
+_current = contextvars.ContextVar("phase_timer", default=None)
+
+
+class PhaseTimer:
+    """Время обработки одной команды или задачи по этапам.
+
+    Таймер становится текущим в контексте через start_timer и доступен
+    всем корутинам и задачам asyncio, созданным внутри этого контекста.
+    Если этапы выполняются параллельно (например, несколько запросов к VK
+    одновременно), их время складывается, поэтому сумма этапов может
+    превышать общее время.
+
+    Attributes:
+        started (float): Время начала по time.monotonic().
+        phases (dict[str, float]): Суммарное время этапов в секундах.
+        rows (int): Количество обработанных строк таблицы или ссылок.
+    """
+
+    def __init__(self):
+        """Инициализирует PhaseTimer с нулевым временем всех этапов."""
+        self.started = time.monotonic()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.rows = 0
+
+    @property
+    def elapsed(self) -> float:
+        """float: Время с начала обработки в секундах."""
+        return time.monotonic() - self.started
+
+    def add(self, name: str, seconds: float) -> None:
+        """Добавляет время к этапу.
+
+        Args:
+            name: Название этапа, см. PHASES.
+            seconds: Длительность в секундах.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+@contextlib.contextmanager
+def start_timer():
+    """Делает новый PhaseTimer текущим на время блока with.
+
+    Yields:
+        PhaseTimer: Таймер обработки.
+    """
+    timer = PhaseTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """Учитывает время блока with в этапе текущего таймера.
+
+    Вне start_timer ничего не делает, поэтому может оборачивать любые
+    обращения к сервисам.
+
+    Args:
+        name: Название этапа, см. PHASES.
+    """
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        timer.add(name, time.monotonic() - started)
+
+
+def add_rows(count: int) -> None:
+    """Увеличивает количество обработанных строк текущего таймера.
+
+    Args:
+        count: Количество строк.
+    """
+    timer = _current.get()
+    if timer is not None:
+        timer.rows += count
+
+
+def log_if_slow(event: str, timer: PhaseTimer, threshold: float, **fields) -> bool:
+    """Записывает обработку в журнал медленных команд, если она дольше порога.
+
+    Args:
+        event: Тип записи, например slow_command или slow_job.
+        timer: Таймер обработки.
+        threshold: Порог в секундах.
+        **fields: Дополнительные поля записи: команда, аргументы, ID чата и т.д.
+
+    Returns:
+        bool: True, если запись сделана.
+    """
+    elapsed = timer.elapsed
+    if elapsed < threshold:
+        return False
+    slow_logger.warning(json.dumps({
+        "event": event,
+        **fields,
+        "elapsed": round(elapsed, 3),
+        "phases": {name: round(seconds, 3) for name, seconds in timer.phases.items()},
+        "rows": timer.rows,
+    }, ensure_ascii=False))
+    return True
+
+
+class TimingMiddleware(BaseMiddleware):
+    """Измеряет время обработки сообщений с разбивкой по этапам.
+
+    Регистрируется как внешний middleware роутера, поэтому учитывает и
+    фильтры, в том числе проверку прав администратора. Команды дольше
+    threshold секунд записываются в журнал медленных команд.
+
+    Attributes:
+        threshold (float): Порог медленной команды в секундах.
+    """
+
+    def __init__(self, threshold: float = 5.0):
+        """Инициализирует TimingMiddleware.
+
+        Args:
+            threshold (float, optional): Порог медленной команды в секундах.
+                Defaults to 5.0.
+        """
+        self.threshold = threshold
+
+    async def __call__(self, handler, event, data):
+        """Выполняет обработку сообщения с текущим PhaseTimer.
+
+        Args:
+            handler: Следующий обработчик в цепочке.
+            event: Сообщение Telegram.
+            data: Данные, передаваемые обработчикам.
+
+        Returns:
+            Any: Результат обработчика.
+        """
+        with start_timer() as timer:
+            try:
+                return await handler(event, data)
+            finally:
+                text = event.text or event.caption or ""
+                if text.startswith("/"):
+                    command, _, args = text.partition(" ")
+                    log_if_slow(
+                        "slow_command", timer, self.threshold,
+                        command=command.split("@")[0],
+                        args=args[:ARGS_MAX_LENGTH],
+                        chat_id=event.chat.id,
+                        user_id=event.from_user.id if event.from_user else None,
+                    )
+
+
+class TelegramTiming(BaseRequestMiddleware):
+    """Учитывает запросы к Telegram Bot API в этапе telegram_reply.
+
+    Регистрируется в сессии бота: bot.session.middleware(TelegramTiming()).
+    """
+
+    async def __call__(self, make_request, bot, method):
+        """Выполняет запрос к Bot API, учитывая его время.
+
+        Args:
+            make_request: Следующий обработчик запроса.
+            bot: Экземпляр Bot.
+            method: Метод Bot API.
+
+        Returns:
+            Any: Ответ Bot API.
+        """
+        with phase("telegram_reply"):
+            return await make_request(bot, method)
@@ -1 +1,6 @@
 from .vk_api import VKLinkManager
+from .async_vk_api import AsyncVKLinkManager
+from .rate_limiter import AdaptiveRateLimiter
+from .token_pool import TokenPool
+from .urls import normalize_url, build_url
+from .stats_cache import StatsCache
@@ -0,0 +1,424 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from links_generator.metrics import BACKEND_ERRORS, track
+from links_generator.timing import phase
+
+from .batch import build_execute_code, chunked, split_execute_response
+from .rate_limiter import RETRYABLE_ERROR_CODES, backoff_delay
+from .stats_cache import StatsCache
+from .token_pool import BENCH_ERROR_CODES, TokenPool
+from .urls import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncVKLinkManager:
+    """Асинхронный менеджер для работы с API VK по сокращению ссылок.
+
+    Аналог VKLinkManager, который не блокирует цикл событий: все запросы
+    выполняются через один общий aiohttp.ClientSession с пулом keep-alive
+    соединений и кэшированием DNS.
+
+    Запросы распределяются по пулу сервисных ключей, каждый ключ имеет свой
+    AdaptiveRateLimiter, а запросы, отклоненные из-за ограничения частоты
+    или сетевых ошибок, повторяются с задержкой.
+
+    Attributes:
+        token_pool (TokenPool): Пул сервисных ключей доступа VK API
+        timeout (aiohttp.ClientTimeout): Таймауты запросов к VK API
+        max_retries (int): Максимальное количество повторов одного запроса
+        link_cache (AsyncDatabaseManager | None): Хранилище уже созданных коротких ссылок
+        stats_cache (StatsCache): Кэш ответов utils.getLinkStats
+    """
+
+    API_URL = "https://api.vk.com/method/"
+    API_VERSION = "5.131"
+
+    def __init__(self, service_tokens, total_timeout=30, connect_timeout=5,
+                 connections_limit=20, dns_cache_ttl=300, token_pool=None,
+                 max_retries=5, link_cache=None, stats_cache=None):
+        """Инициализирует экземпляр AsyncVKLinkManager.
+
+        Сессия создается лениво при первом запросе, так как aiohttp требует
+        запущенного цикла событий.
+
+        Args:
+            service_tokens (str | list[str]): Сервисный ключ или список ключей
+                из настроек приложений VK.
+            total_timeout (float, optional): Общий таймаут запроса в секундах. Defaults to 30.
+            connect_timeout (float, optional): Таймаут установки соединения в секундах. Defaults to 5.
+            connections_limit (int, optional): Максимум одновременных соединений в пуле. Defaults to 20.
+            dns_cache_ttl (int, optional): Время жизни DNS-кэша в секундах. Defaults to 300.
+            token_pool (TokenPool, optional): Готовый пул ключей, например общий
+                для нескольких менеджеров. По умолчанию создается из service_tokens.
+            max_retries (int, optional): Максимальное количество повторов запроса. Defaults to 5.
+            link_cache (AsyncDatabaseManager, optional): Хранилище с асинхронными
+                методами get_cached_short_links и cache_short_links. Перед обращением к VK
+                короткая ссылка ищется в нем. Defaults to None.
+            stats_cache (StatsCache, optional): Кэш статистики переходов.
+                По умолчанию создается собственный.
+        """
+        self.token_pool = token_pool or TokenPool(service_tokens)
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout, connect=connect_timeout)
+        self._connections_limit = connections_limit
+        self._dns_cache_ttl = dns_cache_ttl
+        self._session = None
+        self.max_retries = max_retries
+        self.link_cache = link_cache
+        self.stats_cache = stats_cache or StatsCache()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Возвращает общую сессию, создавая ее при первом обращении.
+
+        Returns:
+            aiohttp.ClientSession: Сессия с пулом keep-alive соединений.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._connections_limit,
+                ttl_dns_cache=self._dns_cache_ttl,
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self) -> None:
+        """Закрывает сессию и освобождает соединения пула."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _call(self, method: str, params: dict, label=None) -> dict:
+        """Выполняет запрос к методу VK API.
+
+        Время вместе с ожиданием ограничителя частоты и повторами учитывается
+        в этапе vk текущего PhaseTimer, а в метриках каждая попытка
+        учитывается отдельно, без ожиданий, см. _request.
+
+        Args:
+            method: Название метода, например 'utils.getShortLink'.
+            params: Параметры запроса без access_token и версии API.
+            label (str, optional): Название запроса в метриках. По умолчанию method.
+
+        Returns:
+            dict: Распарсенный JSON-ответ VK API, см. _request.
+        """
+        with phase("vk"):
+            return await self._request(method, params, label or method)
+
+    async def _request(self, method: str, params: dict, label: str) -> dict:
+        """Выполняет запрос к методу VK API с ограничением частоты и повторами.
+
+        Каждая попытка учитывается в метриках под названием label: сетевая
+        ошибка и ответ с ошибкой VK API считаются ошибками.
+
+        Args:
+            method: Название метода, например 'utils.getShortLink'.
+            params: Параметры запроса без access_token и версии API.
+            label: Название запроса в метриках.
+
+        Returns:
+            dict: Распарсенный JSON-ответ VK API. Если все повторы исчерпаны,
+                возвращается последний ответ с ошибкой.
+
+        Raises:
+            aiohttp.ClientError: Если сетевая ошибка повторилась max_retries раз.
+            asyncio.TimeoutError: Если таймаут повторился max_retries раз.
+        """
+        for attempt in range(self.max_retries + 1):
+            state = await self.token_pool.acquire()
+            request_params = {
+                **params,
+                "access_token": state.token,
+                "v": self.API_VERSION,
+            }
+            started = time.monotonic()
+            try:
+                with track("vk", label):
+                    async with self._get_session().post(
+                            self.API_URL + method, data=request_params) as response:
+                        data = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.token_pool.report_throttle(state)
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            error_code = data.get("error", {}).get("error_code")
+            if error_code is not None:
+                BACKEND_ERRORS.inc("vk", label)
+            if error_code in RETRYABLE_ERROR_CODES:
+                self.token_pool.report_throttle(state)
+                if attempt < self.max_retries:
+                    await asyncio.sleep(backoff_delay(attempt))
+                continue
+            if error_code in BENCH_ERROR_CODES:
+                self.token_pool.report_failure(state, error_code)
+                # Отстраненный ключ можно заменить другим ключом пула
+                if attempt < self.max_retries and len(self.token_pool.states) > 1:
+                    continue
+                return data
+            if error_code is not None:
+                # Ошибка самого запроса, например неверный URL: ключ исправен
+                self.token_pool.report_success(state, time.monotonic() - started)
+                return data
+
+            if any(error.get("error_code") in RETRYABLE_ERROR_CODES
+                   for error in data.get("execute_errors", [])):
+                self.token_pool.report_throttle(state)
+            else:
+                self.token_pool.report_success(
+                    state, time.monotonic() - started)
+            return data
+        return data
+
+    @staticmethod
+    def _link_key(short_url: str) -> str:
+        """Возвращает ключ короткой ссылки VK.
+
+        Args:
+            short_url: Короткая ссылка в формате 'vk.cc/XXXXX' или полный URL.
+
+        Returns:
+            str: Часть ссылки после 'vk.cc/'.
+        """
+        return short_url.replace("https://vk.cc/", "").replace("http://vk.cc/", "")
+
+    def token_stats(self) -> list[dict]:
+        """Возвращает счетчики запросов по каждому сервисному ключу.
+
+        Returns:
+            list[dict]: Счетчики ключей пула, см. TokenPool.stats.
+        """
+        return self.token_pool.stats()
+
+    async def execute_batch(self, method: str, params_list: list[dict]) -> list[tuple]:
+        """Выполняет пакет вызовов одного метода через VKScript execute.
+
+        Вызовы разбиваются на пакеты по 25 штук, каждый пакет уходит одним
+        HTTP-запросом. Ошибки отдельных вызовов не влияют на остальные,
+        вызовы с ошибками ограничения частоты повторяются.
+
+        Args:
+            method: Название метода, например 'utils.getShortLink'.
+            params_list: Список параметров вызовов.
+
+        Returns:
+            list[tuple]: Список пар (результат, ошибка) в порядке params_list.
+        """
+        async def run_chunk(chunk):
+            try:
+                data = await self._call(
+                    "execute", {"code": build_execute_code(method, chunk)},
+                    label=f"execute:{method}")
+            except Exception as e:
+                data = {"error": {"error_msg": str(e)}}
+            return split_execute_response(data, len(chunk))
+
+        results = [None] * len(params_list)
+        pending = list(range(len(params_list)))
+        for attempt in range(self.max_retries + 1):
+            chunks = chunked(pending)
+            chunk_results = await asyncio.gather(
+                *(run_chunk([params_list[i] for i in chunk]) for chunk in chunks))
+
+            # Вызовы, отклоненные внутри execute из-за частоты, отправляем повторно
+            retry = []
+            for chunk, items in zip(chunks, chunk_results):
+                for index, item in zip(chunk, items):
+                    results[index] = item
+                    error = item[1]
+                    if error is not None and error.get("error_code") in RETRYABLE_ERROR_CODES:
+                        retry.append(index)
+            if not retry or attempt == self.max_retries:
+                break
+            await asyncio.sleep(backoff_delay(attempt))
+            pending = retry
+        return results
+
+    async def get_short_links(self, long_urls: list[str], private=False) -> list:
+        """Создает короткие ссылки для списка URL пакетными запросами.
+
+        Ссылки, уже найденные в link_cache, повторно не создаются,
+        новые ссылки сохраняются в link_cache.
+
+        Args:
+            long_urls: Список длинных URL.
+            private (bool, optional): Флаг создания приватных ссылок. Defaults to False.
+
+        Returns:
+            list[str | None]: Короткие ссылки в порядке long_urls,
+                None на месте ссылок, которые не удалось создать.
+        """
+        keys = [normalize_url(url) for url in long_urls]
+        known = {}
+        if self.link_cache is not None:
+            known = await self.link_cache.get_cached_short_links(
+                list(set(keys)), private)
+
+        # Один запрос на каждый уникальный нормализованный URL
+        missing = {}
+        for key, url in zip(keys, long_urls):
+            if key not in known:
+                missing.setdefault(key, url)
+        created = {}
+        if missing:
+            params_list = [{"url": url, "private": 1 if private else 0}
+                           for url in missing.values()]
+            for key, (result, error) in zip(
+                    missing, await self.execute_batch("utils.getShortLink", params_list)):
+                if error is not None:
+                    logger.warning("VK API Error (%s): %s", key, error.get("error_msg"))
+                else:
+                    created[key] = result["short_url"]
+            if created and self.link_cache is not None:
+                await self.link_cache.cache_short_links(created, private)
+
+        known.update(created)
+        return [known.get(key) for key in keys]
+
+    async def get_links_stats(self, short_urls: list[str], interval="day",
+                              use_cache=True) -> list:
+        """Получает статистику переходов для списка коротких ссылок пакетными запросами.
+
+        Статистика, найденная в stats_cache, повторно не запрашивается.
+
+        Args:
+            short_urls: Список коротких ссылок.
+            interval (str, optional): Период агрегации статистики. Defaults to 'day'.
+            use_cache (bool, optional): Использовать ли stats_cache для чтения.
+                Свежие ответы сохраняются в кэш в любом случае. Defaults to True.
+
+        Returns:
+            list[dict | None]: Статистика в порядке short_urls,
+                None на месте ссылок, по которым произошла ошибка.
+
+        Raises:
+            ValueError: Если передан недопустимый интервал.
+        """
+        valid_intervals = ["day", "week", "month", "forever"]
+        if interval not in valid_intervals:
+            raise ValueError(
+                f"Invalid interval. Must be one of {valid_intervals}")
+
+        keys = [self._link_key(url) for url in short_urls]
+        known = {}
+        if use_cache:
+            for key in keys:
+                cached = self.stats_cache.get(key, interval)
+                if cached is not None:
+                    known[key] = cached
+
+        missing = list(dict.fromkeys(key for key in keys if key not in known))
+        if missing:
+            params_list = [{"key": key, "interval": interval} for key in missing]
+            for key, (result, error) in zip(
+                    missing, await self.execute_batch("utils.getLinkStats", params_list)):
+                if error is not None:
+                    logger.warning("VK API Error (%s): %s", key, error.get("error_msg"))
+                    continue
+                self.stats_cache.set(key, interval, result)
+                known[key] = result
+        return [known.get(key) for key in keys]
+
+    async def get_short_link(self, long_url, private=False):
+        """Создает короткую ссылку через VK API.
+
+        Args:
+            long_url (str): Длинный URL, который нужно сократить.
+            private (bool, optional): Флаг создания приватной ссылки. Defaults to False.
+
+        Returns:
+            str | None: Короткая ссылка в формате 'vk.cc/XXXXX' или None в случае ошибки.
+
+        Examples:
+            >>> vk_manager = AsyncVKLinkManager('service_token')
+            >>> await vk_manager.get_short_link('https://example.com')
+            'https://vk.cc/XXXXX'
+        """
+        key = normalize_url(long_url)
+        if self.link_cache is not None:
+            cached = await self.link_cache.get_cached_short_links([key], private)
+            if key in cached:
+                return cached[key]
+
+        params = {
+            "url": long_url,
+            "private": 1 if private else 0,
+        }
+
+        try:
+            data = await self._call("utils.getShortLink", params)
+
+            if "response" in data:
+                short_url = data["response"]["short_url"]
+                if self.link_cache is not None:
+                    await self.link_cache.cache_short_links({key: short_url}, private)
+                return short_url
+
+            error_msg = data.get("error", {}).get("error_msg", "Unknown error")
+            print(f"VK API Error: {error_msg}")
+            return None
+
+        except Exception as e:
+            print(f"Request Error: {e}")
+            return None
+
+    async def get_link_stats(self, short_url, interval="day", use_cache=True):
+        """Получает статистику переходов по короткой ссылке VK.
+
+        Args:
+            short_url (str): Короткая ссылка в формате 'vk.cc/XXXXX' или полный URL.
+            interval (str, optional): Период агрегации статистики.
+                Допустимые значения: 'day', 'week', 'month', 'forever'. Defaults to 'day'.
+            use_cache (bool, optional): Использовать ли stats_cache для чтения. Defaults to True.
+
+        Returns:
+            dict | None: Словарь с данными статистики или None в случае ошибки.
+
+        Raises:
+            ValueError: Если передан недопустимый интервал.
+
+        Examples:
+            >>> vk_manager = AsyncVKLinkManager('service_token')
+            >>> stats = await vk_manager.get_link_stats('https://vk.cc/XXXXX')
+            >>> print(stats)
+            {'key': 'XXXXX', 'stats': [...]}
+        """
+        valid_intervals = ["day", "week", "month", "forever"]
+        if interval not in valid_intervals:
+            raise ValueError(
+                f"Invalid interval. Must be one of {valid_intervals}")
+
+        key = self._link_key(short_url)
+        if use_cache:
+            cached = self.stats_cache.get(key, interval)
+            if cached is not None:
+                return cached
+
+        params = {
+            "key": key,
+            "interval": interval,
+        }
+
+        try:
+            data = await self._call("utils.getLinkStats", params)
+
+            if "response" in data:
+                self.stats_cache.set(key, interval, data["response"])
+                return data["response"]
+
+            error_msg = data.get("error", {}).get("error_msg", "Unknown error")
+            print(f"VK API Error: {error_msg}")
+            return None
+
+        except Exception as e:
+            print(f"Request Error: {e}")
+            return None
@@ -0,0 +1,83 @@
+import json
+
+EXECUTE_LIMIT = 25
+"""int: Максимальное количество вызовов API в одном запросе execute."""
+
+
+def chunked(items: list, size: int = EXECUTE_LIMIT) -> list[list]:
+    """Разбивает список на последовательные части заданного размера.
+
+    Args:
+        items: Исходный список.
+        size: Максимальный размер части. По умолчанию EXECUTE_LIMIT.
+
+    Returns:
+        list[list]: Список частей исходного списка.
+
+    Examples:
+        >>> chunked([1, 2, 3], 2)
+        [[1, 2], [3]]
+    """
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def build_execute_code(method: str, params_list: list[dict]) -> str:
+    """Формирует код VKScript для пакетного вызова метода через execute.
+
+    Каждый элемент params_list превращается в отдельный вызов API,
+    результаты возвращаются массивом в том же порядке.
+
+    Args:
+        method: Название метода, например 'utils.getShortLink'.
+        params_list: Список параметров вызовов (не более EXECUTE_LIMIT).
+
+    Returns:
+        str: Код для параметра code метода execute.
+
+    Raises:
+        ValueError: Если список пуст или превышает EXECUTE_LIMIT.
+
+    Examples:
+        >>> build_execute_code('utils.getShortLink', [{'url': 'https://a.ru'}])
+        'return [API.utils.getShortLink({"url": "https://a.ru"})];'
+    """
+    if not params_list or len(params_list) > EXECUTE_LIMIT:
+        raise ValueError(
+            f"Количество вызовов должно быть от 1 до {EXECUTE_LIMIT}")
+    calls = ", ".join(
+        f"API.{method}({json.dumps(params, ensure_ascii=False)})"
+        for params in params_list
+    )
+    return f"return [{calls}];"
+
+
+def split_execute_response(data: dict, count: int) -> list[tuple]:
+    """Разбирает ответ execute на результаты отдельных вызовов.
+
+    VK возвращает false на месте неудачного вызова, а описания ошибок
+    перечисляет по порядку в поле execute_errors. Ошибка всего запроса
+    (поле error) распространяется на все вызовы.
+
+    Args:
+        data: JSON-ответ метода execute.
+        count: Количество вызовов в пакете.
+
+    Returns:
+        list[tuple]: Список пар (результат, ошибка) для каждого вызова,
+            где ровно один элемент пары не равен None.
+    """
+    if "response" not in data:
+        error = data.get("error", {"error_msg": "Unknown error"})
+        return [(None, error)] * count
+
+    results = data["response"] or []
+    errors = iter(data.get("execute_errors", []))
+    items = []
+    for i in range(count):
+        result = results[i] if i < len(results) else False
+        if result is False or result is None:
+            error = next(errors, {"error_msg": "Unknown error"})
+            items.append((None, error))
+        else:
+            items.append((result, None))
+    return items
@@ -0,0 +1,112 @@
+import asyncio
+import random
+import time
+
+RETRYABLE_ERROR_CODES = {6, 9, 10}
+"""set[int]: Коды ошибок VK API, после которых запрос имеет смысл повторить.
+
+- 6: Too many requests per second
+- 9: Flood control
+- 10: Internal server error
+"""
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 10.0) -> float:
+    """Вычисляет задержку перед повтором запроса (экспоненциальная с полным джиттером).
+
+    Args:
+        attempt: Номер неудачной попытки, начиная с 0.
+        base: Базовая задержка в секундах.
+        cap: Максимальная задержка в секундах.
+
+    Returns:
+        float: Случайная задержка в диапазоне [0, min(cap, base * 2 ** attempt)].
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class AdaptiveRateLimiter:
+    """Ограничитель частоты запросов на основе token bucket с адаптацией AIMD.
+
+    Скорость пополнения корзины растет аддитивно после успешных быстрых
+    запросов и уменьшается мультипликативно при ошибках ограничения частоты
+    или при росте задержек выше целевой.
+
+    Attributes:
+        rate (float): Текущая разрешенная скорость, запросов в секунду.
+        min_rate (float): Нижняя граница скорости.
+        max_rate (float): Верхняя граница скорости.
+    """
+
+    def __init__(self, rate=3.0, min_rate=0.5, max_rate=20.0, increase=0.1,
+                 decrease=0.5, latency_target=1.0, latency_decrease=0.9):
+        """Инициализирует ограничитель.
+
+        Args:
+            rate (float, optional): Начальная скорость, запросов в секунду. Defaults to 3.0.
+            min_rate (float, optional): Минимальная скорость. Defaults to 0.5.
+            max_rate (float, optional): Максимальная скорость. Defaults to 20.0.
+            increase (float, optional): Аддитивный прирост скорости после успеха. Defaults to 0.1.
+            decrease (float, optional): Множитель скорости после ошибки ограничения. Defaults to 0.5.
+            latency_target (float, optional): Целевая задержка ответа в секундах. Defaults to 1.0.
+            latency_decrease (float, optional): Множитель скорости при задержке выше целевой.
+                Defaults to 0.9.
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._increase = increase
+        self._decrease = decrease
+        self._latency_target = latency_target
+        self._latency_decrease = latency_decrease
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def capacity(self) -> float:
+        """float: Емкость корзины — не больше одной секунды запросов на текущей скорости."""
+        return max(1.0, self.rate)
+
+    @property
+    def available(self) -> float:
+        """float: Количество токенов в корзине на текущий момент."""
+        elapsed = time.monotonic() - self._updated
+        return min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def _refill(self) -> None:
+        """Пополняет корзину пропорционально прошедшему времени."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Ожидает свободный токен и забирает его.
+
+        Ожидающие корутины обслуживаются по очереди.
+        """
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self, latency: float) -> None:
+        """Учитывает успешный запрос.
+
+        Args:
+            latency: Время выполнения запроса в секундах.
+        """
+        self._refill()
+        if latency > self._latency_target:
+            self.rate = max(self.min_rate, self.rate * self._latency_decrease)
+        else:
+            self.rate = min(self.max_rate, self.rate + self._increase)
+
+    def on_throttle(self) -> None:
+        """Учитывает ошибку ограничения частоты и снижает скорость."""
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * self._decrease)
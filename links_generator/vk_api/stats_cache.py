@@ -0,0 +1,62 @@
+from cachetools import TTLCache
+
+DEFAULT_TTLS = {
+    "day": 120,
+    "week": 600,
+    "month": 1800,
+    "forever": 3600,
+}
+"""dict[str, int]: Время жизни записей кэша в секундах для каждого интервала статистики."""
+
+
+class StatsCache:
+    """Кэш ответов utils.getLinkStats с ограниченным размером и вытеснением LRU.
+
+    Для каждого интервала статистики используется отдельный TTLCache: данные
+    за день устаревают быстро, агрегированные данные за все время — медленно.
+
+    Attributes:
+        ttls (dict[str, int]): Время жизни записей по интервалам в секундах.
+    """
+
+    def __init__(self, maxsize=5000, ttls=None):
+        """Инициализирует кэш статистики.
+
+        Args:
+            maxsize (int, optional): Максимальное количество записей на один интервал.
+                Defaults to 5000.
+            ttls (dict[str, int], optional): Переопределение времени жизни по интервалам.
+                Defaults to DEFAULT_TTLS.
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._caches = {
+            interval: TTLCache(maxsize=maxsize, ttl=ttl)
+            for interval, ttl in self.ttls.items()
+        }
+
+    def get(self, key: str, interval: str):
+        """Возвращает сохраненную статистику по ключу короткой ссылки.
+
+        Args:
+            key: Ключ короткой ссылки (часть после 'vk.cc/').
+            interval: Интервал статистики.
+
+        Returns:
+            dict | None: Сохраненный ответ VK API или None, если записи нет или она устарела.
+        """
+        return self._caches[interval].get(key)
+
+    def set(self, key: str, interval: str, stats: dict) -> None:
+        """Сохраняет статистику по ключу короткой ссылки.
+
+        Args:
+            key: Ключ короткой ссылки.
+            interval: Интервал статистики.
+            stats: Ответ VK API utils.getLinkStats.
+        """
+        self._caches[interval][key] = stats
+
+    def clear(self) -> None:
+        """Удаляет все записи кэша."""
+        for cache in self._caches.values():
+            cache.clear()
@@ -0,0 +1,198 @@
+import time
+
+from .rate_limiter import RETRYABLE_ERROR_CODES, AdaptiveRateLimiter
+
+BENCH_ERROR_CODES = {5, 29}
+"""set[int]: Коды ошибок VK API, после которых ключ сразу отстраняется.
+
+- 5: User authorization failed (ключ отозван или недействителен)
+- 29: Rate limit reached (исчерпан суточный лимит метода)
+"""
+
+TOKEN_ERROR_CODES = BENCH_ERROR_CODES | RETRYABLE_ERROR_CODES
+"""set[int]: Коды ошибок VK API, вызванные состоянием ключа или квотой, а не запросом.
+
+Только такие ошибки и сетевые ошибки учитываются при отстранении ключа.
+Остальные ошибки, например 100 (неверный параметр), относятся к самому
+запросу: ключ при этом работает исправно.
+"""
+
+
+class TokenState:
+    """Состояние одного сервисного ключа VK в пуле.
+
+    Attributes:
+        token (str): Сервисный ключ доступа VK API.
+        limiter (AdaptiveRateLimiter): Ограничитель частоты запросов этого ключа.
+        requests (int): Количество отправленных запросов.
+        errors (int): Количество сетевых ошибок и ошибок ключа или квоты.
+        throttled (int): Количество ошибок ограничения частоты.
+        consecutive_failures (int): Количество ошибок подряд.
+        benched_until (float): Момент (time.monotonic), до которого ключ отстранен.
+    """
+
+    def __init__(self, token, limiter):
+        """Инициализирует состояние ключа.
+
+        Args:
+            token (str): Сервисный ключ доступа VK API.
+            limiter (AdaptiveRateLimiter): Ограничитель частоты запросов ключа.
+        """
+        self.token = token
+        self.limiter = limiter
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.consecutive_failures = 0
+        self.benched_until = 0.0
+
+    @property
+    def benched(self) -> bool:
+        """bool: True, если ключ временно отстранен."""
+        return time.monotonic() < self.benched_until
+
+    def as_dict(self) -> dict:
+        """Возвращает счетчики ключа без раскрытия самого ключа.
+
+        Returns:
+            dict: Счетчики и текущая скорость ключа.
+        """
+        return {
+            "token": "…" + self.token[-4:],
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "rate": round(self.limiter.rate, 2),
+            "benched": self.benched,
+        }
+
+
+class TokenPool:
+    """Пул сервисных ключей VK с распределением запросов по остатку квоты.
+
+    Каждый ключ имеет собственный AdaptiveRateLimiter. Очередной запрос
+    получает ключ, в корзине которого больше всего свободных токенов;
+    при равенстве ключи выбираются по кругу. Ключ, который несколько раз
+    подряд завершился ошибкой, отстраняется на bench_time секунд.
+
+    Attributes:
+        states (list[TokenState]): Состояния ключей пула.
+    """
+
+    def __init__(self, tokens, rate=3.0, max_rate=20.0, failure_threshold=3,
+                 bench_time=60.0):
+        """Инициализирует пул ключей.
+
+        Args:
+            tokens (str | list[str]): Сервисный ключ или список ключей.
+            rate (float, optional): Начальная скорость одного ключа, запросов в секунду.
+                Defaults to 3.0.
+            max_rate (float, optional): Максимальная скорость одного ключа. Defaults to 20.0.
+            failure_threshold (int, optional): Количество ошибок подряд до отстранения.
+                Defaults to 3.
+            bench_time (float, optional): Время отстранения в секундах. Defaults to 60.0.
+        """
+        if isinstance(tokens, str):
+            tokens = [tokens]
+        tokens = [token for token in tokens or [] if token]
+        self.states = [
+            TokenState(token, AdaptiveRateLimiter(rate=rate, max_rate=max_rate))
+            for token in tokens
+        ]
+        self._failure_threshold = failure_threshold
+        self._bench_time = bench_time
+        self._next = 0
+
+    @classmethod
+    def from_env(cls, value, **kwargs):
+        """Создает пул из строки с ключами, разделенными запятыми.
+
+        Args:
+            value (str): Значение переменной окружения, например VK_TOKEN.
+            **kwargs: Параметры конструктора TokenPool.
+
+        Returns:
+            TokenPool: Пул ключей.
+        """
+        return cls([token.strip() for token in (value or "").split(",")], **kwargs)
+
+    def select(self) -> TokenState:
+        """Выбирает ключ для очередного запроса.
+
+        Returns:
+            TokenState: Неотстраненный ключ с наибольшим остатком квоты, а если
+                отстранены все — ключ, который вернется в работу раньше других.
+
+        Raises:
+            ValueError: Если в пуле нет ни одного ключа.
+        """
+        if not self.states:
+            raise ValueError("Не задан ни один сервисный ключ VK")
+        count = len(self.states)
+        order = [self.states[(self._next + i) % count] for i in range(count)]
+        self._next = (self._next + 1) % count
+
+        active = [state for state in order if not state.benched]
+        if not active:
+            return min(order, key=lambda state: state.benched_until)
+        return max(active, key=lambda state: state.limiter.available)
+
+    async def acquire(self) -> TokenState:
+        """Выбирает ключ и ожидает свободный токен в его ограничителе.
+
+        Returns:
+            TokenState: Ключ, от имени которого нужно отправить запрос.
+        """
+        state = self.select()
+        await state.limiter.acquire()
+        state.requests += 1
+        return state
+
+    def report_success(self, state: TokenState, latency: float) -> None:
+        """Учитывает успешный запрос.
+
+        Args:
+            state: Ключ, использованный для запроса.
+            latency: Время выполнения запроса в секундах.
+        """
+        state.consecutive_failures = 0
+        state.limiter.on_success(latency)
+
+    def report_throttle(self, state: TokenState) -> None:
+        """Учитывает ошибку ограничения частоты.
+
+        Args:
+            state: Ключ, использованный для запроса.
+        """
+        state.throttled += 1
+        state.limiter.on_throttle()
+        self.report_failure(state)
+
+    def report_failure(self, state: TokenState, error_code=None) -> None:
+        """Учитывает ошибку запроса и при необходимости отстраняет ключ.
+
+        Ошибки, не входящие в TOKEN_ERROR_CODES, относятся к запросу, а не
+        к ключу: они сбрасывают счетчик ошибок подряд, как успешный запрос.
+
+        Args:
+            state: Ключ, использованный для запроса.
+            error_code (int, optional): Код ошибки VK API. None — сетевая ошибка
+                или таймаут.
+        """
+        if error_code is not None and error_code not in TOKEN_ERROR_CODES:
+            state.consecutive_failures = 0
+            return
+        state.errors += 1
+        state.consecutive_failures += 1
+        if (error_code in BENCH_ERROR_CODES
+                or state.consecutive_failures >= self._failure_threshold):
+            state.benched_until = time.monotonic() + self._bench_time
+            state.consecutive_failures = 0
+
+    def stats(self) -> list[dict]:
+        """Возвращает счетчики всех ключей пула.
+
+        Returns:
+            list[dict]: Счетчики ключей в порядке их добавления.
+        """
+        return [state.as_dict() for state in self.states]
@@ -0,0 +1,110 @@
+from string import Formatter
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+"""dict[str, int]: Стандартные порты схем, которые удаляются при нормализации."""
+
+UTM_FIELDS = ("abbr", "name")
+"""tuple[str]: Поля партнера, доступные в шаблоне UTM-меток."""
+
+
+def normalize_url(url: str) -> str:
+    """Приводит URL к каноническому виду для использования в качестве ключа кэша.
+
+    Схема и хост приводятся к нижнему регистру, стандартный порт удаляется,
+    пустой путь заменяется на '/', параметры запроса сортируются.
+
+    Args:
+        url: Исходный URL.
+
+    Returns:
+        str: Нормализованный URL.
+
+    Examples:
+        >>> normalize_url('HTTPS://Example.com:443?b=2&a=1')
+        'https://example.com/?a=1&b=2'
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        userinfo = parts.username
+        if parts.password:
+            userinfo += ":" + parts.password
+        host = f"{userinfo}@{host}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, parts.fragment))
+
+
+def build_url(url: str, params: dict[str, str]) -> str:
+    """Добавляет параметры к URL с учетом уже имеющейся строки запроса.
+
+    Существующие параметры сохраняются, параметры с теми же именами
+    заменяются новыми значениями, фрагмент остается в конце URL.
+
+    Args:
+        url: Исходный URL.
+        params: Параметры запроса, которые нужно добавить или заменить.
+
+    Returns:
+        str: URL с объединенной строкой запроса.
+
+    Examples:
+        >>> build_url('https://example.com/?ref=1&utm_source=old#top', {'utm_source': 'abc'})
+        'https://example.com/?ref=1&utm_source=abc#top'
+    """
+    parts = urlsplit(url.strip())
+    query = [(key, value)
+             for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if key not in params]
+    query.extend(params.items())
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def parse_utm_template(template: str) -> list[tuple[str, str]]:
+    """Разбирает шаблон UTM-меток в формате строки запроса.
+
+    Значения могут содержать поля партнера в фигурных скобках, см. UTM_FIELDS.
+
+    Args:
+        template: Шаблон, например 'utm_source={abbr}&utm_campaign=spring'.
+
+    Returns:
+        list[tuple[str, str]]: Пары (параметр, шаблон значения).
+
+    Raises:
+        ValueError: Если шаблон пуст или содержит неизвестные поля.
+
+    Examples:
+        >>> parse_utm_template('utm_source={abbr}&utm_medium=tg')
+        [('utm_source', '{abbr}'), ('utm_medium', 'tg')]
+    """
+    pairs = parse_qsl(template, keep_blank_values=True)
+    if not pairs:
+        raise ValueError("Шаблон UTM-меток пуст")
+    for _, value in pairs:
+        for _, field, _, _ in Formatter().parse(value):
+            if field is not None and field not in UTM_FIELDS:
+                raise ValueError(
+                    f"Неизвестное поле '{{{field}}}', допустимы: "
+                    + ", ".join("{" + name + "}" for name in UTM_FIELDS))
+    return pairs
+
+
+def render_utm(pairs: list[tuple[str, str]], **fields) -> dict[str, str]:
+    """Подставляет поля партнера в разобранный шаблон UTM-меток.
+
+    Args:
+        pairs: Результат parse_utm_template.
+        **fields: Значения полей из UTM_FIELDS.
+
+    Returns:
+        dict[str, str]: Параметры запроса для build_url.
+
+    Examples:
+        >>> render_utm([('utm_source', '{abbr}'), ('utm_medium', 'tg')], abbr='abc', name='ABC')
+        {'utm_source': 'abc', 'utm_medium': 'tg'}
+    """
+    return {key: value.format(**fields) for key, value in pairs}
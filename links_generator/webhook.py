@@ -0,0 +1,102 @@
+import asyncio
+import contextlib
+import logging
+import signal
+
+from aiogram import BaseMiddleware
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyLimitMiddleware(BaseMiddleware):
+    """Ограничивает количество одновременно обрабатываемых обновлений.
+
+    В режиме webhook каждое обновление обрабатывается в отдельной задаче
+    сразу после ответа Telegram, поэтому всплеск обновлений иначе привел бы
+    к такому же всплеску запросов к VK, Google Sheets и базе данных.
+    Обновления сверх лимита ждут своей очереди.
+
+    Attributes:
+        limit (int): Максимальное количество одновременно обрабатываемых обновлений.
+    """
+
+    def __init__(self, limit: int):
+        """Инициализирует ConcurrencyLimitMiddleware.
+
+        Args:
+            limit: Максимальное количество одновременно обрабатываемых обновлений.
+        """
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __call__(self, handler, event, data):
+        """Выполняет обработчик обновления, когда освободится место.
+
+        Args:
+            handler: Следующий обработчик в цепочке.
+            event: Обновление Telegram.
+            data: Данные, передаваемые обработчикам.
+
+        Returns:
+            Any: Результат обработчика.
+        """
+        async with self._semaphore:
+            return await handler(event, data)
+
+
+async def run_webhook(dp, bot, url: str, path: str, secret: str, host: str = "0.0.0.0",
+                      port: int = 8080, max_updates: int = 16) -> None:
+    """Принимает обновления через webhook до сигнала SIGTERM или SIGINT.
+
+    Регистрирует webhook в Telegram и запускает встроенный aiohttp-сервер.
+    По сигналу сервер останавливается и функция возвращает управление,
+    чтобы вызывающий код освободил ресурсы — как dp.start_polling.
+    Обновления, накопившиеся за время перезапуска, не сбрасываются —
+    Telegram доставит их после запуска сервера. Запросы без правильного
+    заголовка X-Telegram-Bot-Api-Secret-Token отклоняются.
+
+    Args:
+        dp: Экземпляр Dispatcher из aiogram.
+        bot: Экземпляр Bot из aiogram.
+        url: Внешний адрес бота без пути, например https://bot.example.com.
+        path: Путь webhook, например /webhook.
+        secret: Секретный токен webhook.
+        host (str, optional): Адрес, на котором слушает сервер. Defaults to "0.0.0.0".
+        port (int, optional): Порт сервера. Defaults to 8080.
+        max_updates (int, optional): Лимит одновременно обрабатываемых обновлений.
+            Defaults to 16.
+    """
+    dp.update.outer_middleware(ConcurrencyLimitMiddleware(max_updates))
+
+    app = web.Application()
+    SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=secret).register(app, path=path)
+    setup_application(app, dp, bot=bot)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    signals = (signal.SIGTERM, signal.SIGINT)
+    for sig in signals:
+        # На Windows обработчики сигналов в цикле событий недоступны
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stopped.set)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+        await bot.set_webhook(
+            url.rstrip("/") + path,
+            secret_token=secret,
+            allowed_updates=dp.resolve_used_update_types(),
+            drop_pending_updates=False,
+        )
+        logger.info("Webhook запущен на %s:%s%s", host, port, path)
+        await stopped.wait()
+        logger.info("Получен сигнал остановки, webhook останавливается")
+    finally:
+        for sig in signals:
+            with contextlib.suppress(NotImplementedError):
+                loop.remove_signal_handler(sig)
+        await runner.cleanup()
@@ -0,0 +1,140 @@
+import pytest
+
+from links_generator.databases.jobs import JobStore
+
+PARAMS = {"link": "https://example.com"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    """JobStore во временном файле."""
+    return JobStore(str(tmp_path / "jobs.db"))
+
+
+def test_enqueue_creates_queued_job(store):
+    job_id, created = store.enqueue("create_links", 1, "T", PARAMS)
+
+    job = store.get(job_id)
+    assert created
+    assert job["status"] == "queued"
+    assert job["params"] == PARAMS
+    assert (job["chat_id"], job["table_id"]) == (1, "T")
+
+
+def test_enqueue_deduplicates_unfinished_job_of_same_chat(store):
+    job_id, _ = store.enqueue("create_links", 1, "T", PARAMS)
+
+    assert store.enqueue("create_links", 1, "T", dict(PARAMS)) == (job_id, False)
+    store.claim_next([])
+    assert store.enqueue("create_links", 1, "T", PARAMS) == (job_id, False)
+
+
+def test_enqueue_does_not_share_jobs_between_chats(store):
+    first, _ = store.enqueue("create_links", 1, "T", PARAMS)
+    second, created = store.enqueue("create_links", 2, "T", PARAMS)
+
+    assert created
+    assert second != first
+
+
+@pytest.mark.parametrize("status", ["done", "failed"])
+def test_enqueue_after_finish_creates_new_job(store, status):
+    job_id, _ = store.enqueue("create_links", 1, "T", PARAMS)
+    store.claim_next([])
+    store.finish(job_id, status)
+
+    new_id, created = store.enqueue("create_links", 1, "T", PARAMS)
+    assert created
+    assert new_id != job_id
+
+
+def test_claim_next_takes_oldest_job_and_skips_busy_tables(store):
+    first, _ = store.enqueue("create_links", 1, "T1", PARAMS)
+    second, _ = store.enqueue("create_links", 1, "T2", PARAMS)
+
+    job = store.claim_next(["T1"])
+    assert job["id"] == second
+    assert job["status"] == "running"
+    assert job["started_at"] is not None
+
+    assert store.claim_next([])["id"] == first
+    assert store.claim_next([]) is None
+
+
+def test_requeue_running_returns_interrupted_jobs(store):
+    running, _ = store.enqueue("create_links", 1, "T", PARAMS)
+    queued, _ = store.enqueue("create_links", 1, "T", {"link": "https://example.org"})
+    store.claim_next([])
+
+    assert store.requeue_running() == 1
+    assert store.get(running)["status"] == "queued"
+    assert store.get(queued)["status"] == "queued"
+    assert store.claim_next([])["id"] == running
+
+
+def test_cancel(store):
+    job_id, _ = store.enqueue("create_links", 1, "T", PARAMS)
+    store.claim_next([])
+    store.save_checkpoints(job_id, [("C", 2, "https://example.com", "https://vk.cc/a")])
+
+    assert store.cancel(job_id) == "running"
+    assert store.get(job_id)["status"] == "cancelled"
+    assert store.get_checkpoints(job_id) == {}
+    assert store.cancel(job_id) == "cancelled"
+    assert store.cancel(job_id + 1) is None
+
+
+def test_finish_keeps_cancelled_status(store):
+    job_id, _ = store.enqueue("create_links", 1, "T", PARAMS)
+    store.claim_next([])
+    store.cancel(job_id)
+
+    store.finish(job_id, "done")
+    assert store.get(job_id)["status"] == "cancelled"
+
+
+def test_finish_records_error_and_drops_checkpoints(store):
+    job_id, _ = store.enqueue("create_links", 1, "T", PARAMS)
+    store.claim_next([])
+    store.save_checkpoints(job_id, [("C", 2, "https://example.com", "https://vk.cc/a")])
+
+    store.finish(job_id, "failed", "boom")
+
+    job = store.get(job_id)
+    assert (job["status"], job["error"]) == ("failed", "boom")
+    assert job["finished_at"] is not None
+    assert store.get_checkpoints(job_id) == {}
+
+
+def test_checkpoints_survive_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+    job_id, _ = store.enqueue("create_links", 1, "T", PARAMS)
+    store.claim_next([])
+    store.set_progress(job_id, 3, 2, 0)
+    store.save_checkpoints(job_id, [
+        ("C", 2, "https://example.com?a", "https://vk.cc/a"),
+        ("C", 3, "https://example.com?b", "https://vk.cc/b"),
+    ])
+    # Повторная запись строки заменяет прежнюю ссылку
+    store.save_checkpoints(job_id, [("C", 3, "https://example.com?b", "https://vk.cc/B")])
+    del store
+
+    restarted = JobStore(path)
+    assert restarted.requeue_running() == 1
+    job = restarted.claim_next([])
+    assert job["id"] == job_id
+    assert (job["total"], job["done"]) == (3, 2)
+    assert restarted.get_checkpoints(job_id) == {
+        ("C", 2): ("https://example.com?a", "https://vk.cc/a"),
+        ("C", 3): ("https://example.com?b", "https://vk.cc/B"),
+    }
+
+
+def test_list_jobs_returns_chat_jobs_newest_first(store):
+    first, _ = store.enqueue("create_links", 1, "T", PARAMS)
+    store.enqueue("create_links", 2, "T", PARAMS)
+    second, _ = store.enqueue("create_links", 1, "T", {"link": "https://example.org"})
+
+    assert [job["id"] for job in store.list_jobs(1)] == [second, first]
+    assert [job["id"] for job in store.list_jobs(1, limit=1)] == [second]
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from links_generator.databases.jobs import JobStore
+from links_generator.googletables.partner_index import PartnerIndex
+from links_generator.jobs import JobQueue
+from links_generator.vk_api.urls import build_url
+
+LINK = "https://example.com"
+
+
+class FakeSheets:
+    """Таблица с партнерами part0..partN и записью в память."""
+
+    def __init__(self, count):
+        self.partner_index = PartnerIndex()
+        self.count = count
+        self.writes = {}
+
+    async def get_partners(self):
+        return [[f"Партнер {i}", f"part{i}", "", "", ""] for i in range(self.count)]
+
+    async def batch_update_values(self, data):
+        self.writes.update(data)
+
+
+class FakePool:
+    def __init__(self, sheets):
+        self.sheets = sheets
+
+    def get(self, table_id):
+        return self.sheets
+
+
+class FakeVK:
+    """Сокращает ссылки и запоминает, какие URL запрашивались."""
+
+    def __init__(self):
+        self.urls = []
+
+    async def get_short_links(self, urls):
+        self.urls.extend(urls)
+        return [f"https://vk.cc/{url.rsplit('=', 1)[-1]}" for url in urls]
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+    async def edit_message_text(self, text, chat_id, message_id):
+        pass
+
+
+async def wait_finished(queue, job_id, timeout=5.0):
+    """Ожидает завершения задачи и возвращает ее."""
+    async with asyncio.timeout(timeout):
+        while True:
+            job = await queue.get(job_id)
+            if job["status"] not in JobStore.ACTIVE:
+                return job
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"))
+
+
+def test_interrupted_job_resumes_from_checkpoints(store):
+    job_id, _ = store.enqueue("create_links", 1, "T", {"link": LINK})
+    store.claim_next([])
+    # Прошлый запуск успел создать ссылки для первых двух строк
+    store.save_checkpoints(job_id, [
+        ("C", row, build_url(LINK, {"utm_source": f"part{row - 2}"}), f"https://vk.cc/old{row}")
+        for row in (2, 3)
+    ])
+    sheets, vk, bot = FakeSheets(4), FakeVK(), FakeBot()
+
+    async def run():
+        queue = JobQueue(store, FakePool(sheets), vk)
+        await queue.start(bot)
+        try:
+            return await wait_finished(queue, job_id)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(run())
+
+    assert job["status"] == "done"
+    assert (job["done"], job["total"]) == (4, 4)
+    assert vk.urls == [build_url(LINK, {"utm_source": f"part{i}"}) for i in (2, 3)]
+    assert [entry.short_link for entry in sheets.partner_index.entries()] == [
+        "https://vk.cc/old2", "https://vk.cc/old3", "https://vk.cc/part2", "https://vk.cc/part3"]
+    assert store.get_checkpoints(job_id) == {}
+
+
+def test_failed_job_does_not_stop_worker(store):
+    bad_id, _ = store.enqueue("unknown", 1, "T", {})
+    good_id, _ = store.enqueue("create_links", 1, "T", {"link": LINK})
+    bot = FakeBot()
+
+    async def run():
+        queue = JobQueue(store, FakePool(FakeSheets(2)), FakeVK(), workers=1)
+        await queue.start(bot)
+        try:
+            return (await wait_finished(queue, bad_id),
+                    await wait_finished(queue, good_id))
+        finally:
+            await queue.stop()
+
+    bad, good = asyncio.run(run())
+
+    assert bad["status"] == "failed"
+    assert "unknown" in bad["error"]
+    assert good["status"] == "done"
+    assert bot.sent[0] == (1, f"Задача #{bad_id} завершилась с ошибкой: {bad['error']}")